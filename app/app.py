@@ -3,40 +3,52 @@
 # Purpose: Single-page app that shows ROI = (Current - Funded) / Funded for a wallet.
 # Behavior: Address input (auto-run), validation, cached fetches, results cards, Pro-gated token tile, last-address persistence.
 
-import os, sys, pathlib, json, re
+import os, sys, re, io, zipfile, functools, threading, atexit
 from pathlib import Path
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Make sure project root is importable
-sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+APP_DIR = Path(__file__).resolve().parent
+ROOT_DIR = APP_DIR.parent
 
+# Make sure project root is importable (guarded: the script body re-runs on every interaction)
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+import orjson
 import streamlit as st
 from dotenv import load_dotenv
 
 # Real module imports (keep these!)
-from mvp.funding_v1 import get_funding
-from mvp.balances_moralis import get_portfolio
+# The fetcher modules (mvp.funding_v1 / balances_moralis / defunding) are imported lazily inside the
+# cached wrappers: they pull in requests + load data files, and an invalid address never needs them.
 from mvp.pnl import compute_pnl
-from mvp.defunding import get_defunding
 from mvp.secrets import get_secret, save_lead
+from mvp.redis_cache import TTL_POLICY, StaleResult, cached_fetch
 
 # --- Email-based rate limit (persisted to disk) ---
 import hashlib
 
-RATE_DB_PATH = Path(__file__).resolve().parents[1] / "data" / "rate_limit.json"
+RATE_DB_PATH = ROOT_DIR / "data" / "rate_limit.json"
 THROTTLE_MINUTES = 60  # (jargon: configurable constant) (plain: 1 hour per email for new addresses)
 
 def _email_key(email: str) -> str:
     """Stable, privacy-friendly key for disk (hash of email).
     (jargon: salted/hashed identifier) (plain: we don't store the raw email on disk)"""
+    cached = st.session_state.get("_email_key_cached")  # (email, key) set once per session
+    if cached and cached[0] == email:
+        return cached[1]
     e = (email or "").strip().lower()
-    return hashlib.sha256(e.encode("utf-8")).hexdigest()[:16]
+    key = hashlib.sha256(e.encode("utf-8")).hexdigest()[:16]
+    st.session_state._email_key_cached = (email, key)
+    return key
 
 def _load_rate_db() -> dict:
     try:
         RATE_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
         if RATE_DB_PATH.exists():
-            return json.loads(RATE_DB_PATH.read_text())
+            return orjson.loads(RATE_DB_PATH.read_bytes())
         return {}
     except Exception:
         return {}
@@ -44,11 +56,38 @@ def _load_rate_db() -> dict:
 def _save_rate_db(db: dict) -> None:
     try:
         tmp = RATE_DB_PATH.with_suffix(".tmp")
-        tmp.write_text(json.dumps(db, indent=2))
+        tmp.write_bytes(orjson.dumps(db, option=orjson.OPT_INDENT_2))
         tmp.replace(RATE_DB_PATH)
     except Exception:
         pass
 
+RATE_FLUSH_SECONDS = 60  # (plain: write-back to disk at most once a minute; dirty state is also flushed at exit)
+
+@st.cache_resource(show_spinner=False)
+def _rate_db_handle() -> dict:
+    """Process-wide in-memory copy of the rate DB (jargon: write-coalescing) (plain: parse once, write rarely)."""
+    handle = {"db": _load_rate_db(), "lock": threading.Lock(), "dirty": False, "flushed_at": time.time()}
+    atexit.register(_flush_rate_db, handle, True)
+    return handle
+
+def _flush_rate_db(handle: dict, force: bool = False) -> None:
+    """Persist if there are unsaved changes and the flush interval has passed (or force=True)."""
+    if not handle["dirty"]:
+        return
+    if force or time.time() - handle["flushed_at"] >= RATE_FLUSH_SECONDS:
+        _save_rate_db(handle["db"])
+        handle["dirty"] = False
+        handle["flushed_at"] = time.time()
+
+def _set_rate_record(handle: dict, key: str, rec: dict | None) -> None:
+    """Mutate the in-memory DB (rec=None deletes) and schedule a write-back. Call with handle["lock"] held."""
+    if rec is None:
+        handle["db"].pop(key, None)
+    else:
+        handle["db"][key] = rec
+    handle["dirty"] = True
+    _flush_rate_db(handle)
+
 def enforce_rate_limit(email: str, address: str) -> tuple[bool, str | None]:
     """
     Return (ok, retry_at_str). If ok=False, caller should stop and show retry time.
@@ -58,49 +97,68 @@ def enforce_rate_limit(email: str, address: str) -> tuple[bool, str | None]:
         # if somehow we got here without the gate, be safe and allow
         return True, None
 
-    db = _load_rate_db()
+    handle = _rate_db_handle()
     key = _email_key(email)
-    rec = db.get(key, {"last_addr": None, "last_ts": None})
+    with handle["lock"]:
+        _flush_rate_db(handle)  # opportunistic write-back of earlier changes
+        rec = handle["db"].get(key, {"last_addr": None, "last_ts": None})
 
-    # Is this a NEW address? (we only throttle new addresses; re-running same addr is fine)
-    is_new = (address or "").lower() != (rec.get("last_addr") or "").lower()
+        # Is this a NEW address? (we only throttle new addresses; re-running same addr is fine)
+        is_new = (address or "").lower() != (rec.get("last_addr") or "").lower()
 
-    if not is_new:
-        return True, None  # same address → always ok
+        if not is_new:
+            return True, None  # same address → always ok
 
-    # If we’ve never seen this email, allow and record
-    now = datetime.utcnow()
-    if not rec.get("last_ts"):
-        rec = {"last_addr": address, "last_ts": now.isoformat()}
-        db[key] = rec
-        _save_rate_db(db)
-        return True, None
+        # If we’ve never seen this email, allow and record
+        # (jargon: epoch seconds) (plain: time.time() floats — cheaper than datetime math, still valid across restarts)
+        now = time.time()
+        if not rec.get("last_ts"):
+            _set_rate_record(handle, key, {"last_addr": address, "last_ts": now})
+            return True, None
 
-    # If seen: check elapsed time
-    try:
-        last_ts = datetime.fromisoformat(rec["last_ts"])
-    except Exception:
-        last_ts = now
-
-    delta = now - last_ts
-    if delta < timedelta(minutes=THROTTLE_MINUTES):
-        retry_at = (last_ts + timedelta(minutes=THROTTLE_MINUTES)).strftime("%H:%M UTC")
-        return False, retry_at
-
-    # Passed window → allow and update
-    rec = {"last_addr": address, "last_ts": now.isoformat()}
-    db[key] = rec
-    _save_rate_db(db)
-    return True, None
+        # If seen: check elapsed time
+        try:
+            last_ts = rec["last_ts"]
+            if isinstance(last_ts, str):  # older records stored a naive-UTC ISO string
+                last_ts = datetime.fromisoformat(last_ts).replace(tzinfo=timezone.utc).timestamp()
+            last_ts = float(last_ts)
+        except Exception:
+            last_ts = now
+
+        window = THROTTLE_MINUTES * 60
+        if now - last_ts < window:
+            retry_at = time.strftime("%H:%M UTC", time.gmtime(last_ts + window))
+            return False, retry_at
+
+        # Passed window → allow and update
+        _set_rate_record(handle, key, {"last_addr": address, "last_ts": now})
+        return True, None
 
 EMAIL_RE = re.compile(r"^[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}$", re.I)
-DISPOSABLE = {"mailinator.com", "10minutemail.com", "tempmail.com", "sharklasers.com"}  # tiny optional list
+DISPOSABLE = frozenset({"mailinator.com", "10minutemail.com", "tempmail.com", "sharklasers.com"})  # tiny built-in list
+DISPOSABLE_FILE = ROOT_DIR / "data" / "disposable.txt"  # optional: one domain per line (large public lists)
 
-def _is_disposable(email: str) -> bool:
+@st.cache_resource(show_spinner=False)
+def _disposable_domains() -> frozenset:
+    """Built-in list + optional data/disposable.txt, built once per process (frozenset: O(1) lookups)."""
+    domains = set(DISPOSABLE)
     try:
-        return email.split("@", 1)[1].lower() in DISPOSABLE
+        if DISPOSABLE_FILE.exists():
+            with DISPOSABLE_FILE.open() as f:
+                for line in f:
+                    line = line.strip().lower()
+                    if line and not line.startswith("#"):
+                        domains.add(line)
     except Exception:
+        pass
+    return frozenset(domains)
+
+def _is_disposable(email: str) -> bool:
+    """Called after EMAIL_RE matched, so there is exactly one '@' with a domain after it."""
+    idx = email.rfind("@")
+    if idx == -1:
         return True
+    return email[idx + 1:].lower() in _disposable_domains()
 
 def email_gate() -> bool:
     """
@@ -133,6 +191,7 @@ def email_gate() -> bool:
         # ✅ Passed
         st.session_state.email_ok = True
         st.session_state.user_email = email
+        _email_key(email)  # warm the per-session key cache
         save_lead(email)  # no-op if LEADS_WEBHOOK_URL not set
         st.rerun()        # <-- refresh page so the form disappears
         return True
@@ -143,10 +202,15 @@ def email_gate() -> bool:
 # Page config FIRST
 
 # --- Config & Theme (must be first) ---
-favicon_path = Path(__file__).resolve().parent / "assets" / "favicon.ico"
+@st.cache_resource(show_spinner=False)
+def asset_path(name: str) -> str | None:
+    """app/assets/<name> as a string if it exists, else None (stat'ed once per process)."""
+    p = APP_DIR / "assets" / name
+    return str(p) if p.exists() else None
+
 st.set_page_config(
     page_title="WalletGlass — ROI, not vibes.",
-    page_icon=str(favicon_path) if favicon_path.exists() else "💎",
+    page_icon=asset_path("favicon.ico") or "💎",
     layout="centered",
     initial_sidebar_state="collapsed",
 )
@@ -159,37 +223,51 @@ with st.sidebar:
         st.caption(f"Signed in as **{st.session_state['user_email']}**")
 
 
+@st.cache_resource(show_spinner=False)
+def _startup() -> bool:
+    """Once-per-process setup: load .env (if your SDKs read from env) and touch required keys.
+    Raises RuntimeError on a missing secret — exceptions are not cached, so a fix is picked up on rerun."""
+    load_dotenv()
+    # Touch the keys to force a clear error early
+    get_secret("MORALIS_API_KEY")
+    get_secret("ETHERSCAN_API_KEY")
+    return True
+
 def _require_secrets():
     try:
-        # Touch the keys to force a clear error early
-        _ = get_secret("MORALIS_API_KEY")
-        _ = get_secret("ETHERSCAN_API_KEY")
+        _startup()
     except RuntimeError as e:
-        import streamlit as st
         st.error(str(e))
         st.stop()
 
 _require_secrets()
 
 
-st.markdown("""
-<style>
+_BASE_CSS = """
 /* Hide footer / “Made with Streamlit” badge */
 footer {visibility: hidden;}
 /* Hide the top toolbar (deploy/fork badge area on Community Cloud) */
 [data-testid="stToolbar"] {display: none;}
 /* Hide the hamburger MainMenu (we already removed items via menu_items) */
 #MainMenu {visibility: hidden;}
-</style>
-""", unsafe_allow_html=True)
-st.markdown("""
-<style>
 /* Reduce the top padding in the main app */
 .block-container {
     padding-top: 1rem;   /* default is ~6rem; try 0 or 1rem */
 }
-</style>
-""", unsafe_allow_html=True)
+"""
+
+@st.cache_resource(show_spinner=False)
+def _css_blob() -> str:
+    """Inline CSS + theme.css as one minified <style> tag, built once per process.
+    (plain: comments/whitespace stripped — this string is re-sent to the browser on every rerun)"""
+    css_path = APP_DIR / "theme.css"
+    theme = css_path.read_text() if css_path.exists() else ""
+    css = re.sub(r"/\*.*?\*/", "", _BASE_CSS + theme, flags=re.S)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)  # not ":" — "a :hover" ≠ "a:hover"
+    css = re.sub(r"\s+", " ", css).strip()
+    return f"<style>{css}</style>"
+
+st.markdown(_css_blob(), unsafe_allow_html=True)
 
 from urllib.parse import urlencode
 
@@ -212,6 +290,23 @@ def use_dev_mode() -> bool:
     return dev
 
 
+@st.cache_resource(show_spinner=False)
+def _mvp_exists() -> bool:
+    return ROOT_DIR.joinpath("mvp").exists()
+
+@st.cache_resource(show_spinner=False)
+def _funding_debug_info() -> dict:
+    """Import/introspection facts for the DEV funding tab (computed once per process)."""
+    try:
+        import inspect, mvp.funding_v1 as funding_mod
+        return {
+            "path": inspect.getsourcefile(funding_mod),
+            "has_get_funding": hasattr(funding_mod, "get_funding"),
+        }
+    except Exception as e:
+        return {"error": _fmt_err(e)}
+
+
 DEV = use_dev_mode()
 
 if DEV:
@@ -221,61 +316,206 @@ if DEV:
     st.caption("Top sys.path entries:")
     for p in sys.path[:5]:
         st.caption(f"• {p}")
-    st.caption(f"mvp exists: {pathlib.Path(__file__).resolve().parents[1].joinpath('mvp').exists()}")
+    st.caption(f"mvp exists: {_mvp_exists()}")
 if DEV and st.sidebar.button("Reset my rate limit"):
-    db = _load_rate_db()
+    handle = _rate_db_handle()
     key = _email_key(st.session_state.get("user_email",""))
-    if key in db:
-        db.pop(key, None)
-        _save_rate_db(db)
-        st.success("Rate limit reset for your email.")
+    with handle["lock"]:
+        if key in handle["db"]:
+            _set_rate_record(handle, key, None)
+            _flush_rate_db(handle, force=True)
+            st.success("Rate limit reset for your email.")
 
 # ... (CSS load, helpers, etc.)
 
-@st.cache_data(ttl=600, show_spinner=False)
-def cached_funding(address: str) -> dict:
-    return get_funding(address)      # uses imported function
+# --- Cache observability (DEV "Cache" tab) ---
+class CacheStats:
+    """Process-wide call latencies + miss counts per cached function (thread-safe: fetches run in a pool)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: dict[str, list[float]] = {}
+        self.misses: dict[str, int] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.latencies.setdefault(name, []).append(seconds)
+
+    def miss(self, name: str) -> None:
+        with self._lock:
+            self.misses[name] = self.misses.get(name, 0) + 1
+
+    def summary(self) -> list[dict]:
+        with self._lock:
+            rows = []
+            for name, lat in self.latencies.items():
+                lat = sorted(lat)
+                calls, misses = len(lat), self.misses.get(name, 0)
+                rows.append({
+                    "function": name,
+                    "calls": calls,
+                    "misses": misses,
+                    "hit_rate": round(1 - misses / calls, 3) if calls else None,
+                    "p50_ms": round(lat[calls // 2] * 1000, 2),
+                    "p95_ms": round(lat[min(calls - 1, int(calls * 0.95))] * 1000, 2),
+                })
+            return rows
+
+@st.cache_resource(show_spinner=False)
+def _cache_stats() -> CacheStats:
+    return CacheStats()
+
+def timed_cache(ttl: int, max_entries: int | None = None):
+    """st.cache_data(ttl, max_entries) that also records latency per call and counts real executions (misses)."""
+    stats = _cache_stats()  # resolved here, on the script thread; wrappers may run in worker threads
+
+    def deco(fn):
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def counted(*args, **kwargs):
+            stats.miss(name)  # body only runs on a cache miss
+            return fn(*args, **kwargs)
+
+        cached = st.cache_data(ttl=ttl, max_entries=max_entries, show_spinner=False)(counted)
+
+        @functools.wraps(fn)
+        def wrap(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return cached(*args, **kwargs)
+            finally:
+                stats.record(name, time.perf_counter() - t0)
+
+        wrap.clear = cached.clear
+        return wrap
+    return deco
+
+# Funding/defunding history is effectively fixed per address → long TTL; balances move → short TTL.
+# max_entries LRU-evicts old wallets so memory stays bounded on Streamlit Cloud.
+# Balances use the Redis portfolio ceiling: a longer st TTL in front would hide Redis' 10–30 s refresh.
+# History keeps its day-long per-process copy; Redis' 30–60 min TTL only decides when a cold
+# worker/restart refetches instead of reusing another worker's result.
+HISTORY_TTL = 24 * 60 * 60
+BALANCES_TTL = TTL_POLICY["portfolio"][1]
+CACHE_MAX_ENTRIES = 256
+
+# Stale fallbacks (upstream down, Redis served the last good copy) travel *around* the st caches
+# as StaleResult — exceptions are never cached — so recovery shows up on the next rerun instead
+# of the stale copy being pinned for HISTORY_TTL.
+def _fresh_or_raise(kind: str, address: str, fetch) -> dict:
+    d = cached_fetch(kind, address, fetch)
+    if d.get("stale"):
+        raise StaleResult(d)
+    return d
+
+def _serve_stale(fn, shape=lambda d: d):
+    """Call a cached fn; on StaleResult return the stale copy (reshaped like fn's result) uncached."""
+    @functools.wraps(fn)
+    def wrap(address: str) -> dict:
+        try:
+            return fn(address)
+        except StaleResult as e:
+            return shape(e.data)
+    return wrap
+
+# Cold detail (full payload incl. events/tokens): st.cache_resource hands back the same object, no pickling.
+# cached_fetch = shared Redis layer underneath (no-op without REDIS_URL)
+@st.cache_resource(ttl=HISTORY_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _funding_detail(address: str) -> dict:
+    from mvp.funding_v1 import get_funding
+    return _fresh_or_raise("funding", address, get_funding)
+
+@st.cache_resource(ttl=BALANCES_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _portfolio_detail(address: str) -> dict:
+    from mvp.balances_moralis import get_portfolio
+    return _fresh_or_raise("portfolio", address, get_portfolio)
+
+@st.cache_resource(ttl=HISTORY_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _defunding_detail(address: str) -> dict:
+    from mvp.defunding import get_defunding
+    return _fresh_or_raise("defunding", address, get_defunding)
 
-@st.cache_data(ttl=600, show_spinner=False)
-def cached_portfolio(address: str) -> dict:
-    return get_portfolio(address)    # uses imported function
+funding_detail = _serve_stale(_funding_detail)
+portfolio_detail = _serve_stale(_portfolio_detail)
+defunding_detail = _serve_stale(_defunding_detail)
 
-@st.cache_data(ttl=600, show_spinner=False)
-def cached_defunding(address: str) -> dict:
-    return get_defunding(address)
+# Hot summary: the few scalars the page needs on every rerun (tiny cache entries)
+def _funding_summary(d: dict) -> dict:
+    return {"funded_usd": d.get("funded_usd", 0.0), "stale": d.get("stale", False)}
 
-DATA_DIR = Path(__file__).resolve().parents[1] / "data"
-DATA_DIR.mkdir(exist_ok=True)
-LAST_ADDR_FILE = DATA_DIR / "last_address.json"
+def _portfolio_summary(d: dict) -> dict:
+    return {"current_value_usd": d.get("current_value_usd", 0.0), "stale": d.get("stale", False)}
+
+def _defunding_summary(d: dict) -> dict:
+    return {"defunded_usd": d.get("defunded_usd", 0.0), "stale": d.get("stale", False)}
+
+@timed_cache(ttl=HISTORY_TTL, max_entries=CACHE_MAX_ENTRIES)
+def funding_summary(address: str) -> dict:
+    return _funding_summary(_funding_detail(address))
+
+@timed_cache(ttl=BALANCES_TTL, max_entries=CACHE_MAX_ENTRIES)
+def portfolio_summary(address: str) -> dict:
+    return _portfolio_summary(_portfolio_detail(address))
+
+@timed_cache(ttl=HISTORY_TTL, max_entries=CACHE_MAX_ENTRIES)
+def defunding_summary(address: str) -> dict:
+    return _defunding_summary(_defunding_detail(address))
+
+cached_funding = _serve_stale(funding_summary, _funding_summary)
+cached_portfolio = _serve_stale(portfolio_summary, _portfolio_summary)
+cached_defunding = _serve_stale(defunding_summary, _defunding_summary)
+
+DATA_DIR = ROOT_DIR / "data"
+
+@st.cache_resource(show_spinner=False)
+def _ensure_data_dir() -> bool:
+    DATA_DIR.mkdir(exist_ok=True)
+    return True
+
+_ensure_data_dir()
+LAST_ADDR_FILE = DATA_DIR / "last_address.txt"  # single line: the address, nothing else
+LEGACY_LAST_ADDR_FILE = DATA_DIR / "last_address.json"  # old {"address", "ts"} format, migrated on first read
 
 DEMO_ADDR = "0xc0ffee254729296a45a3885639AC7E10F9d54979"
-ADDR_RE = re.compile(r"^0x[a-fA-F0-9]{40}$")
 
-# Free-tier throttle (one new address per 5 minutes)
-THROTTLE_MINUTES = 60
+def is_evm_addr(s: str) -> bool:
+    """0x + 40 hex chars, checked by CPython's C hex decoder instead of the regex engine.
+    (plain: same rule as ^0x[a-fA-F0-9]{40}$; the 20-byte check rejects embedded spaces)"""
+    if len(s) != 42 or not s.startswith("0x"):
+        return False
+    try:
+        return len(bytes.fromhex(s[2:])) == 20
+    except ValueError:
+        return False
+
 
-css_path = Path(__file__).with_name("theme.css")
-if css_path.exists():
-    st.markdown(f"<style>{css_path.read_text()}</style>", unsafe_allow_html=True)
 def _fmt_err(e: Exception) -> str:
     # (pretty error string)
     return f"{type(e).__name__}: {getattr(e, 'args', [''])[0]}"
 if DEV:
-    with st.expander("🧪 Funding sanity panel", expanded=False):
+    # One expander, one tab per panel; the PnL/defunding tabs are filled after the pipeline runs
+    with st.expander("🧪 Dev panels", expanded=False):
+        tab_funding, tab_portfolio, tab_pnl, tab_defunding, tab_cache = st.tabs(
+            ["Funding", "Portfolio", "PnL", "Defunding", "Cache"]
+        )
+
+    with tab_funding:
         st.caption("Quick visibility into imports, caching, and return shape.")
 
         # Show exactly what we’re importing
-        try:
-            import inspect, mvp.funding_v1 as funding_mod
-            st.write("**funding_v1 path:**", inspect.getsourcefile(funding_mod))
-            st.write("**has `get_funding`?**", hasattr(funding_mod, "get_funding"))
-        except Exception as e:
-            st.error("Import problem: " + _fmt_err(e))
+        info = _funding_debug_info()
+        if "error" in info:
+            st.error("Import problem: " + info["error"])
+        else:
+            st.write("**funding_v1 path:**", info["path"])
+            st.write("**has `get_funding`?**", info["has_get_funding"])
 
         # Dry-run call (no cache) against the current address, but don't block the main pipeline
         try:
             test_addr = st.session_state.get("active_address", None) or DEMO_ADDR
             if st.button("Run quick get_funding() test"):
+                from mvp.funding_v1 import get_funding
                 out = get_funding(test_addr)  # direct call (bypasses cache)
                 st.success(f"get_funding() OK — funded_usd={out.get('funded_usd')}, events={len(out.get('events', []))}")
                 st.json({k: out[k] for k in ("funded_usd",) if k in out})
@@ -290,9 +530,9 @@ if DEV:
             st.error("get_funding() raised an error: " + _fmt_err(e))
             st.exception(e)  # full traceback, helpful during dev
 
-if DEV:
-    with st.expander("🧪 Portfolio sanity panel", expanded=False):
+    with tab_portfolio:
         if st.button("Run quick get_portfolio() test"):
+            from mvp.balances_moralis import get_portfolio
             out = get_portfolio(st.session_state.get("active_address", DEMO_ADDR))
             st.success(f"current_value_usd={out.get('current_value_usd')}, tokens={len(out.get('tokens', []))}")
             st.json({"current_value_usd": out.get("current_value_usd")})
@@ -301,33 +541,33 @@ if DEV:
 
 
 
-# --- Load env keys (if your SDKs read from env) ---
-load_dotenv()
-
-@st.cache_data(ttl=600, show_spinner=False)
-def cached_funding(address: str) -> dict:
-    return get_funding(address)   # ← imported from mvp.funding_v1
-
-@st.cache_data(ttl=600, show_spinner=False)
-def cached_portfolio(address: str) -> dict:
-    return get_portfolio(address) # ← imported from mvp.balances_moralis
-
-@st.cache_data(ttl=600, show_spinner=False)
-def cached_defunding(address: str) -> dict:
-    return get_defunding(address)
-
 def save_last_address(addr: str):
     try:
-        LAST_ADDR_FILE.write_text(json.dumps({"address": addr, "ts": datetime.utcnow().isoformat()}))
+        LAST_ADDR_FILE.write_text(addr)
     except Exception:
         pass
+    load_last_address.clear()  # next read picks up the new file
 
+@st.cache_resource(show_spinner=False)
 def load_last_address() -> str | None:
+    """Process-level cache (plain: read the file once, not on every rerun)."""
     try:
-        obj = json.loads(LAST_ADDR_FILE.read_text())
-        return obj.get("address")
+        return LAST_ADDR_FILE.read_text().strip() or None
+    except FileNotFoundError:
+        pass
     except Exception:
         return None
+    # No .txt yet: carry over the address from the old JSON file (once; the .txt wins afterwards)
+    try:
+        addr = orjson.loads(LEGACY_LAST_ADDR_FILE.read_bytes()).get("address")
+    except Exception:
+        return None
+    if addr:
+        try:
+            LAST_ADDR_FILE.write_text(addr)
+        except Exception:
+            pass
+    return addr or None
 
 def format_usd(x: float) -> str:
     return f"${x:,.2f}"
@@ -341,13 +581,28 @@ def roi_delta_color(roi_pct: float) -> str:
     """Return a Streamlit delta color: 'normal' (green up / red down) or 'off'."""
     return "normal" if abs(roi_pct) >= 0.10 else "off"  # 0.10% = near-zero threshold
 
+def payload_digest(payloads: dict[str, dict]) -> str:
+    """Content hash of the report payloads, so a refresh (or a stale fallback) gets its own zip."""
+    raw = orjson.dumps(payloads, option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+@st.cache_data(ttl=600, max_entries=32, show_spinner=False)
+def build_report_zip(address: str, digest: str, _payloads: dict[str, dict]) -> bytes:
+    """One DEFLATE-compressed archive with every dataset, built once per (address, payload digest).
+    (jargon: leading underscore = excluded from cache hashing) (plain: digest stands in for the payloads in the key)"""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as z:
+        for name, obj in _payloads.items():
+            z.writestr(f"wallet_{name}.json", orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    return buf.getvalue()
+
 # --- Header ---
 left, right = st.columns([1,1])
 with left:
-    logo_path = Path(__file__).resolve().parent / "assets" / "logo.png"
-    if logo_path.exists():
+    logo_path = asset_path("logo.png")
+    if logo_path:
         # Streamlit serves it safely, scales with width %
-        st.image(str(logo_path), use_container_width=True)
+        st.image(logo_path, use_container_width=True)
         
     else:
         st.markdown("### 💎 WalletGlass")
@@ -358,8 +613,6 @@ st.markdown(
         unsafe_allow_html=True
     )
 # --- Session / throttle setup ---
-if "last_switch_ts" not in st.session_state:
-    st.session_state.last_switch_ts = None
 if "active_address" not in st.session_state:
     st.session_state.active_address = load_last_address() or DEMO_ADDR
 
@@ -380,7 +633,7 @@ with col2:
             st.success("Loaded last address.")
 
 # Validate
-if not ADDR_RE.match(addr):
+if not is_evm_addr(addr):
     st.warning("Please enter a valid EVM address (0x + 40 hex chars).")
     st.stop()
 
@@ -401,34 +654,39 @@ if is_new_address:
 
 # --- Pipeline status ---
 with st.status("Running analysis…", expanded=False) as status:
-    status.update(label="1/3 Fetching funding (Moralis + Etherscan checks)…")
+    status.update(label="1/3 Fetching funding, defunding & balances…")
+    # The three sources are independent I/O-bound calls → fetch them concurrently
+    # (jargon: thread pool) (plain: total wait ≈ the slowest call, not the sum)
+    fetchers = {
+        "funding": (cached_funding, "Funding error: "),
+        "defunding": (cached_defunding, "Defunding error: "),
+        "portfolio": (cached_portfolio, "Balances error: "),
+    }
+    results: dict[str, dict] = {}
+    with ThreadPoolExecutor(max_workers=len(fetchers), thread_name_prefix="wg-fetch") as pool:
+        futures = {pool.submit(fn, addr): name for name, (fn, _) in fetchers.items()}
+        for fut in as_completed(futures):
+            name = futures[fut]
+            try:
+                results[name] = fut.result()
+            except Exception as e:
+                st.error(fetchers[name][1] + _fmt_err(e))
+                status.update(state="error")
+                st.stop()
+            status.update(label=f"2/3 Fetched {name} ({len(results)}/3)…")
+
     try:
-        funding = cached_funding(addr)   # (jargon: cache = memoized data; speeds up repeats)
+        funding = results["funding"]   # (jargon: cache = memoized data; speeds up repeats)
         funded_usd = float(funding.get("funded_usd", 0.0))
-        funding_events = funding.get("events", [])
-    except Exception as e:
-        st.error("Funding error: " + _fmt_err(e))
-        status.update(state="error")
-        st.stop()
-    # NEW: defunding (tiny extra call; also cached)
-    try:
-        defunding = cached_defunding(addr)
+        defunding = results["defunding"]
         defunded_usd = float(defunding.get("defunded_usd", 0.0))
-        defund_events = defunding.get("events", [])
-    except Exception as e:
-        st.error("Defunding error: " + _fmt_err(e))
-        status.update(state="error")
-        st.stop()
-    status.update(label="2/3 Fetching balances…")
-    try:
-        portfolio = cached_portfolio(addr)
+        portfolio = results["portfolio"]
         current_usd = float(portfolio.get("current_value_usd", 0.0))
     except Exception as e:
-        st.error(f"Balances error: {e}")
+        st.error("Fetch result error: " + _fmt_err(e))
         status.update(state="error")
         st.stop()
 
-
     status.update(label="3/3 Computing ROI…")
     try:
         pnl = compute_pnl(funded_usd, defunded_usd, current_usd)
@@ -438,46 +696,65 @@ with st.status("Running analysis…", expanded=False) as status:
         st.stop()
     status.update(label="Done", state="complete")
 
+stale = [name for name, d in (("funding", funding), ("defunding", defunding), ("portfolio", portfolio)) if d.get("stale")]
+if stale:
+    st.warning(f"Showing last known {', '.join(stale)} data — the upstream API is currently failing.")
+
 
 if DEV:
-    with st.expander("🧪 PnL sanity panel", expanded=False):
+    with tab_pnl:
         st.caption("Uses the two upstream totals to compute net & ROI.")
         st.json({
             "funded_usd": funded_usd,
             "current_value_usd": current_usd,
             "computed": pnl
         })
-if DEV:
-    with st.expander("🧪 Defunding sanity panel", expanded=False):
+    with tab_defunding:
+        defund_events = defunding_detail(addr).get("events", [])  # detail only loaded when DEV is on
         st.caption(f"{len(defund_events)} outbound events (first 10 shown)")
         st.json(defund_events[:10])
+    with tab_cache:
+        st.caption("Process-wide: calls, real fetches (misses), and latency per cached fetcher.")
+        st.dataframe(_cache_stats().summary(), use_container_width=True)
 
 # --- Results ---
 st.subheader("Your ROI snapshot")
 
-c1, c2, c5 = st.columns([1,1,1])
-c1.metric("Total Funded", format_usd(funded_usd))
-c2.metric("Current Value", format_usd(current_usd))
-c5.metric("Total Defunded", format_usd(defunded_usd))
-
 net = float(pnl["net_pnl_usd"])
 roi = float(pnl["roi_pct"])
 dc = roi_delta_color(roi)
 
+# Every display string, formatted once per rerun
+fmt = {
+    "funded": format_usd(pnl["funded_usd"]),
+    "current": format_usd(pnl["current_value_usd"]),
+    "defunded": format_usd(pnl["defunded_usd"]),
+    "net": format_usd(net),
+    "signed_net": signed_usd(net),
+    "roi": f"{roi:.2f}%",
+    "roi_delta": f"{roi:+.2f}%",
+}
+
+c1, c2, c5 = st.columns([1,1,1])
+# One metric per card, all sourced from compute_pnl's rounded output
+c1.metric("Total Funded", fmt["funded"])
+c2.metric("Current Value", fmt["current"])
+c5.metric("Total Defunded", fmt["defunded"])
+
 c3,c4 = st.columns(2)
 # Net PnL card: show the number as value, color via ROI delta
 c3.metric(
     "Net PnL",
-    format_usd(net),
-    delta=f"{roi:+.2f}%",
+    fmt["net"],
+    delta=fmt["roi_delta"],
     delta_color=dc
 )
 
 # ROI card: show ROI as value, color via Net PnL size/sign (nice reinforcement)
 c4.metric(
     "ROI",
-    f"{roi:.2f}%",
-    delta=signed_usd(net),
+    fmt["roi"],
+    delta=fmt["signed_net"],
     delta_color=dc
 )
 
@@ -491,19 +768,23 @@ pro_col.button("Upgrade", disabled=True)
 
 # Downloads
 st.divider()
-dl1, dl2, dl3 = st.columns(3)
-with dl1:
-    st.download_button("Download funding.json",
-        data=json.dumps(funding, indent=2), file_name="wallet_funding.json")
-with dl2:
-    st.download_button("Download portfolio.json",
-        data=json.dumps(portfolio, indent=2), file_name="wallet_portfolio.json")
-with dl3:
-    st.download_button("Download pnl.json",
-        data=json.dumps(pnl, indent=2), file_name="wallet_pnl.json")
-# NEW:
-with st.columns(3)[0]:
-    st.download_button("Download defunding.json",
-        data=json.dumps(defunding, indent=2), file_name="wallet_defunding.json")
-
-st.caption(f"Last updated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}")
+# Full payloads are only hydrated (detail fetch + zip build) after an explicit click for this address
+if st.session_state.get("report_addr") != addr:
+    if st.button("Prepare report.zip"):
+        st.session_state.report_addr = addr
+        st.rerun()
+else:
+    payloads = {
+        "funding": funding_detail(addr),
+        "defunding": defunding_detail(addr),
+        "portfolio": portfolio_detail(addr),
+        "pnl": pnl,
+    }
+    st.download_button(
+        "Download report.zip",
+        data=build_report_zip(addr, payload_digest(payloads), payloads),
+        file_name="wallet_report.zip",
+        mime="application/zip",
+    )
+
+st.caption(f"Last updated: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
@@ -1,7 +1,12 @@
 # 🔮 alchemy.py — Alchemy-based transaction fetcher for WalletGlass
 
 import os
+import asyncio
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,22 +18,92 @@ HEADERS = {
     "Content-Type": "application/json",
 }
 
+# Persistent session: keep-alive reuses one pooled TLS connection instead of a handshake per call
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=None),
+))
+
 # ----------------------------
 # 🔧 JSON-RPC Request Helper
 # ----------------------------
 def make_rpc_request(method, params):
-    response = requests.post(
+    # orjson both ways: bytes body out, bytes parsed in (Content-Type is set on the session)
+    response = _SESSION.post(
         BASE_URL,
-        headers=HEADERS,
-        json={
+        data=orjson.dumps({
             "jsonrpc": "2.0",
             "id": 1,
             "method": method,
             "params": params,
-        },
+        }),
     )
     response.raise_for_status()
-    return response.json().get("result")
+    return orjson.loads(response.content).get("result")
+
+# ----------------------------
+# 📦 JSON-RPC Batch Helper
+# ----------------------------
+RPC_BATCH_SIZE = 100       # calls per HTTP POST
+RPC_MAX_CONCURRENCY = 10   # batch POSTs in flight at once (stay under Alchemy's CU/s limit)
+
+def _batch_payloads(calls):
+    """Split [(method, params), ...] into JSON-RPC batch bodies of RPC_BATCH_SIZE calls."""
+    return [
+        [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls[start:start + RPC_BATCH_SIZE])
+        ]
+        for start in range(0, len(calls), RPC_BATCH_SIZE)
+    ]
+
+def _ordered_results(payload, items):
+    """Batch responses may come back in any order; re-align them to the request ids."""
+    by_id = {item.get("id"): item.get("result") for item in items}
+    return [by_id.get(call["id"]) for call in payload]
+
+def _post_batch(payload):
+    response = _SESSION.post(BASE_URL, data=orjson.dumps(payload))
+    response.raise_for_status()
+    return _ordered_results(payload, orjson.loads(response.content))
+
+def make_rpc_batch(calls, max_workers=1):
+    """
+    Send [(method, params), ...] as JSON-RPC batch POSTs (RPC_BATCH_SIZE calls each).
+    Returns results in the same order as `calls` (None for calls that errored).
+    max_workers > 1 sends the batch POSTs from a thread pool (shares the pooled _SESSION).
+    """
+    payloads = _batch_payloads(calls)
+    if max_workers > 1 and len(payloads) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(payloads))) as pool:
+            chunks = list(pool.map(_post_batch, payloads))
+    else:
+        chunks = [_post_batch(p) for p in payloads]
+    return [result for chunk in chunks for result in chunk]
+
+async def make_rpc_batch_async(calls, max_concurrency=RPC_MAX_CONCURRENCY):
+    """
+    Same contract as make_rpc_batch, but the batch POSTs run concurrently over one
+    aiohttp session (pooled sockets + cached DNS), capped by a semaphore.
+    """
+    import aiohttp  # only needed on the async ingestion path
+
+    payloads = _batch_payloads(calls)
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def post(session, payload):
+        async with sem:
+            async with session.post(BASE_URL, data=orjson.dumps(payload)) as response:
+                response.raise_for_status()
+                return _ordered_results(payload, orjson.loads(await response.read()))
+
+    connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(headers=HEADERS, connector=connector) as session:
+        chunks = await asyncio.gather(*(post(session, p) for p in payloads))
+    return [result for chunk in chunks for result in chunk]
 
 # ----------------------------------------
 # 📥 Fetch Normal Transactions
@@ -66,6 +141,24 @@ def get_transaction_receipt(tx_hash):
 def get_transaction(tx_hash):
     return make_rpc_request("eth_getTransactionByHash", [tx_hash])
 
+def batch_get_transactions(hashes):
+    """eth_getTransactionByHash for many hashes in batch POSTs → {hash: tx} (tx is None if not found)."""
+    hashes = list(dict.fromkeys(hashes))  # dedupe, keep order
+    results = make_rpc_batch(
+        [("eth_getTransactionByHash", [h]) for h in hashes],
+        max_workers=RPC_MAX_CONCURRENCY,
+    )
+    return dict(zip(hashes, results))
+
+def batch_get_transaction_receipts(hashes):
+    """eth_getTransactionReceipt for many hashes in batch POSTs → {hash: receipt}."""
+    hashes = list(dict.fromkeys(hashes))
+    results = make_rpc_batch(
+        [("eth_getTransactionReceipt", [h]) for h in hashes],
+        max_workers=RPC_MAX_CONCURRENCY,
+    )
+    return dict(zip(hashes, results))
+
 # Example Usage (for dev/testing only)
 if __name__ == "__main__":
     wallet = "0x4Ac92D60CB6415232E62db519657c33ABdcd102F"
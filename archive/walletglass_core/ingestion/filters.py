@@ -1,21 +1,27 @@
 from decimal import Decimal
 from typing import List
-from ..processing.transaction import Transaction
+import numpy as np
+from ..processing.transaction import Transaction, TransactionBatch, address_bytes, address_key
 from ..constants import MIN_FUNDING_USD
 
 def filter_small_transfers(transactions: List[Transaction], min_eth: Decimal = Decimal("0.005")) -> List[Transaction]:
     """Ignore ETH transfers below a certain threshold."""
-    return [tx for tx in transactions if tx.value_eth >= min_eth]
+    batch = TransactionBatch(transactions)
+    return batch.select(batch.values >= float(min_eth))
 
 def is_internal_transfer(tx: Transaction, wallet_address: str) -> bool:
     """Detect if the transaction is self-sent (from and to same wallet)."""
-    return tx.from_address.lower() == wallet_address.lower() and tx.to_address.lower() == wallet_address.lower()
+    wallet = address_bytes(wallet_address)
+    return wallet is not None and tx.from_bytes == wallet and tx.to_bytes == wallet
 
 def detect_funding_events(transactions: List[Transaction], wallet_address: str, min_eth: Decimal = Decimal("0.01")) -> List[Transaction]:
     """Return large incoming transfers that might represent funding events."""
-    return [
-        tx for tx in transactions
-        if tx.to_address.lower() == wallet_address.lower()
-        and tx.value_eth >= min_eth
-        and tx.from_address.lower() != wallet_address.lower()
-    ]
+    wallet_k = address_key(wallet_address)
+    if wallet_k is None:
+        return []  # a malformed wallet matches nothing
+    batch = TransactionBatch(transactions)
+    wallet_h = np.uint64(wallet_k)
+    to_wallet = batch.to_valid & (batch.to_hash == wallet_h)
+    from_wallet = batch.from_valid & (batch.from_hash == wallet_h)
+    mask = to_wallet & (batch.values >= float(min_eth)) & ~from_wallet
+    return batch.select(mask)
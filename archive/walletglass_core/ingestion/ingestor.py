@@ -19,19 +19,22 @@ Future: Chain-agnostic ingestion wrapper
 """
 
 import os
+import asyncio
 from dotenv import load_dotenv
 from walletglass_core.ingestion.alchemy import (
     get_normal_transactions,
     get_internal_transactions,
-    get_logs_for_tx,
-    get_decoded_tx_input
+    make_rpc_batch_async,
 )
 from walletglass_core.processing.transaction_normalizer import normalize_all
 
 load_dotenv()
 
 def ingest_wallet_activity(address):
-    """Pulls all relevant tx data for a wallet via Alchemy."""
+    """Pulls all relevant tx data for a wallet via Alchemy. (Sync wrapper — callers don't change.)"""
+    return asyncio.run(_ingest_async(address))
+
+async def _ingest_async(address):
     print(f"\n🚀 Ingesting wallet activity for {address}...")
 
     normal_txs = get_normal_transactions(address)
@@ -40,20 +43,21 @@ def ingest_wallet_activity(address):
     internal_txs = get_internal_transactions(address)
     print(f"✅ Internal txs fetched: {len(internal_txs)}")
 
-    enriched_txs = []
-
-    for tx in normal_txs:
-        tx_hash = tx.get("hash")
-        if not tx_hash:
-            continue
-
-        logs = get_logs_for_tx(tx_hash)
-        decoded_input = get_decoded_tx_input(tx_hash)
+    # Receipt (logs) + tx body (input) for every tx, sent as JSON-RPC batches instead of 2 POSTs per tx
+    txs_with_hash = [tx for tx in normal_txs if tx.get("hash")]
+    calls = []
+    for tx in txs_with_hash:
+        calls.append(("eth_getTransactionReceipt", [tx["hash"]]))
+        calls.append(("eth_getTransactionByHash", [tx["hash"]]))
+    results = await make_rpc_batch_async(calls)
 
+    enriched_txs = []
+    for i, tx in enumerate(txs_with_hash):
+        receipt, tx_body = results[2 * i], results[2 * i + 1]
         enriched_txs.append({
             "tx": tx,
-            "logs": logs,
-            "decoded_input": decoded_input,
+            "logs": (receipt or {}).get("logs", []),
+            "decoded_input": tx_body,
         })
 
     normalized = normalize_all(enriched_txs)
@@ -6,25 +6,30 @@ ETH pricing module for WalletGlass.
 - Loads static ETH/USD prices from eth_prices.json
 - Attempts real-time and historical fetches from CryptoCompare (primary)
 - Falls back to yfinance (secondary) if API fails
-- Includes internal caching for efficiency
+- Includes internal caching for efficiency (fallback lookups persisted to data/eth_prices.parquet)
 - Exposes `get_price_at_time()` and `fetch_current_eth_price()` for use across modules
 
 This file is critical for accurate USD-denominated PnL calculations.
 """
 
 import os
-import json
+import atexit
+import orjson
 import requests
-import pandas as pd
-import yfinance as yf
-from datetime import datetime
-from decimal import Decimal
-from rich import print
+from datetime import datetime, timezone
+from functools import lru_cache
+import logging
+
+# pandas / numpy / yfinance are imported inside the functions that need them:
+# lookups served from STATIC_PRICE_CACHE never pay their import time or memory.
+
+log = logging.getLogger(__name__)
 
 # -----------------------------
 # GLOBAL CACHES
 # -----------------------------
 _price_cache = {}
+_price_by_day = {}  # UTC day number (ts // 86400) → price; skips the date formatting on repeat days
 STATIC_PRICE_CACHE = {}
 
 # -----------------------------
@@ -33,14 +38,67 @@ STATIC_PRICE_CACHE = {}
 try:
     json_path = os.path.join(os.path.dirname(__file__), "..", "data", "eth_prices.json")
 
-    with open(json_path, "r") as f:
-        raw_prices = json.load(f)
+    with open(json_path, "rb") as f:
+        raw_prices = orjson.loads(f.read())
         STATIC_PRICE_CACHE = {
-            date: Decimal(str(price)) for date, price in raw_prices.items()
+            date: float(price) for date, price in raw_prices.items()
         }
-        print(f"[green]✔ Loaded {len(STATIC_PRICE_CACHE)} static prices from eth_prices.json[/green]")
+        log.info("Loaded %d static prices from eth_prices.json", len(STATIC_PRICE_CACHE))
 except Exception as e:
-    print(f"[red]❌ Failed to load static price cache: {e}[/red]")
+    log.error("Failed to load static price cache: %s", e)
+
+# -----------------------------
+# PERSISTED FALLBACK LOOKUPS (PARQUET)
+# -----------------------------
+# Prices learned from the yfinance fallback survive restarts here.
+# Historical daily closes never change, so entries need no TTL.
+PRICE_CACHE_PARQUET = os.path.join(os.path.dirname(__file__), "..", "data", "eth_prices.parquet")
+_learned_prices = {}
+_learned_loaded = False
+_learned_dirty = False  # new prices since the last flush; written once per batch / at exit
+
+
+def _load_learned_prices() -> None:
+    """Read the parquet file once, on the first lookup that misses the static cache."""
+    global _learned_loaded
+    if _learned_loaded:
+        return
+    _learned_loaded = True
+    try:
+        if os.path.exists(PRICE_CACHE_PARQUET):
+            import pandas as pd
+            df = pd.read_parquet(PRICE_CACHE_PARQUET)
+            _learned_prices.update(zip(df["date"], df["price"].astype(float)))
+            _price_cache.update(_learned_prices)
+            log.info("Loaded %d persisted prices from eth_prices.parquet", len(_learned_prices))
+    except Exception as e:
+        log.error("Failed to load persisted price cache: %s", e)
+
+
+def _persist_learned_price(date_str: str, price: float) -> None:
+    """Record a fallback-fetched price; flush_learned_prices() writes them all in one go."""
+    global _learned_dirty
+    _learned_prices[date_str] = price
+    _learned_dirty = True
+
+
+def flush_learned_prices() -> None:
+    """Rewrite eth_prices.parquet once if fallback lookups learned new prices (needs pyarrow)."""
+    global _learned_dirty
+    if not _learned_dirty:
+        return
+    try:
+        import pandas as pd
+        df = pd.DataFrame({"date": list(_learned_prices), "price": list(_learned_prices.values())})
+        tmp = PRICE_CACHE_PARQUET + ".tmp"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, PRICE_CACHE_PARQUET)
+        _learned_dirty = False
+    except Exception as e:
+        log.warning("Could not persist %d learned prices: %s", len(_learned_prices), e)
+
+
+atexit.register(flush_learned_prices)  # single get_price_at_time callers: written once at exit
 
 # -----------------------------
 # CRYPTOCOMPARE HISTORICAL DAILY API
@@ -48,9 +106,9 @@ except Exception as e:
 def fetch_eth_prices_by_range(start_ts: int, end_ts: int) -> dict:
     """
     Fetch ETH/USD daily prices from CryptoCompare API for the range.
-    Returns a dictionary with 'YYYY-MM-DD' as keys and Decimal prices.
+    Returns a dictionary with 'YYYY-MM-DD' as keys and float prices.
     """
-    print(f"> Fetching ETH prices from {start_ts} to {end_ts}...")
+    log.info("Fetching ETH prices from %s to %s", start_ts, end_ts)
     url = "https://min-api.cryptocompare.com/data/v2/histoday"
     params = {
         "fsym": "ETH",
@@ -59,18 +117,20 @@ def fetch_eth_prices_by_range(start_ts: int, end_ts: int) -> dict:
         "toTs": end_ts,
     }
     response = requests.get(url, params=params)
-    data = response.json()
+    data = orjson.loads(response.content)
 
     if data.get("Response") != "Success":
-        print("[yellow]⚠ CryptoCompare failed, falling back to yfinance...[/yellow]")
+        log.warning("CryptoCompare failed, falling back to yfinance")
         return fetch_eth_prices_from_yfinance(start_ts, end_ts)
 
-    prices = {}
-    for entry in data["Data"]["Data"]:
-        date = datetime.utcfromtimestamp(entry["time"]).strftime("%Y-%m-%d")
-        prices[date] = Decimal(str(entry["close"]))
-
-    return prices
+    # Columnar: one C-level timestamp → date-string pass instead of a strftime per entry
+    import numpy as np
+    import pandas as pd
+    entries = data["Data"]["Data"]
+    ts = np.fromiter((e["time"] for e in entries), dtype=np.int64, count=len(entries))
+    closes = np.fromiter((e["close"] for e in entries), dtype=np.float64, count=len(entries))
+    dates = pd.to_datetime(ts, unit="s", utc=True).strftime("%Y-%m-%d")
+    return dict(zip(dates, closes.tolist()))
 
 # -----------------------------
 # FALLBACK: YFINANCE
@@ -79,64 +139,119 @@ def fetch_eth_prices_from_yfinance(start_ts: int, end_ts: int) -> dict:
     """
     Use yfinance to get ETH-USD daily close prices in the given range.
     """
-    start_dt = datetime.utcfromtimestamp(start_ts).strftime("%Y-%m-%d")
-    end_dt = datetime.utcfromtimestamp(end_ts).strftime("%Y-%m-%d")
-    print(f">> Pulling fallback daily ETH prices via yfinance from {start_dt} to {end_dt}")
+    start_dt = datetime.fromtimestamp(start_ts, tz=timezone.utc).strftime("%Y-%m-%d")
+    end_dt = datetime.fromtimestamp(end_ts, tz=timezone.utc).strftime("%Y-%m-%d")
+    log.info("Pulling fallback daily ETH prices via yfinance from %s to %s", start_dt, end_dt)
 
+    import yfinance as yf
     df = yf.download("ETH-USD", start=start_dt, end=end_dt, progress=False)
     if df.empty:
-        print("[red]❌ Error: No price data returned[/red]")
+        log.error("yfinance returned no price data")
         return {}
 
     prices = {}
     for date, row in df.iterrows():
         date_str = date.strftime("%Y-%m-%d")
-        prices[date_str] = Decimal(str(row["Close"]))
+        prices[date_str] = float(row["Close"])
 
     return prices
 
+YF_START_DATE = "2015-08-07"  # first ETH-USD trading day on Yahoo
+
+
+@lru_cache(maxsize=1)
+def _load_eth_series(start: str, end: str) -> "pd.Series":
+    """
+    Single yfinance download of ETH-USD daily closes, indexed by 'YYYY-MM-DD'.
+    Cached per (start, end) — i.e. at most one network call per day per process.
+    """
+    import pandas as pd
+    import yfinance as yf
+
+    df = yf.download("ETH-USD", start=start, end=end, interval="1d", progress=False)
+    if df.empty:
+        return pd.Series(dtype="float64")
+    close = df["Close"]
+    if isinstance(close, pd.DataFrame):  # newer yfinance returns per-ticker columns
+        close = close.iloc[:, 0]
+    close = close.astype("float64")
+    close.index = close.index.strftime("%Y-%m-%d")
+    return close
+
 # -----------------------------
 # PRICE LOOKUP
 # -----------------------------
-def get_price_at_time(timestamp: int) -> Decimal:
+def get_price_at_time(timestamp: int) -> float:
     """
     Returns the daily average ETH price for a given UNIX timestamp.
     Tries cache → static → yfinance (as fallback).
+    Float throughout; callers that need Decimal convert with Decimal(str(price)).
+    Found prices are memoized per UTC day; misses (0.0) are not, so they are retried.
     """
-    tx_time = datetime.utcfromtimestamp(timestamp)
+    day = int(timestamp) // 86400
+    price = _price_by_day.get(day)
+    if price is not None:
+        return price
+
+    tx_time = datetime.fromtimestamp(timestamp, tz=timezone.utc)
     date_str = tx_time.strftime("%Y-%m-%d")
 
     # Cache lookup
     if date_str in _price_cache:
+        _price_by_day[day] = _price_cache[date_str]
         return _price_cache[date_str]
 
     # Static cache fallback
     if date_str in STATIC_PRICE_CACHE:
         price = STATIC_PRICE_CACHE[date_str]
-        _price_cache[date_str] = price
-        print(f"[green]✔ Used static cached price for {date_str}: ${price}[/green]")
+        _price_cache[date_str] = _price_by_day[day] = price
+        log.debug("Used static cached price for %s: $%s", date_str, price)
         return price
 
-    # Try yfinance fallback
-    print(f"[yellow]⚠ No price found for {date_str}, attempting yfinance...[/yellow]")
+    # Prices learned by earlier fallbacks (persisted across restarts)
+    _load_learned_prices()
+    if date_str in _price_cache:
+        _price_by_day[day] = _price_cache[date_str]
+        return _price_cache[date_str]
+
+    # Try yfinance fallback (one batched download for the whole history, then O(1) lookups)
+    log.warning("No price found for %s, attempting yfinance", date_str)
     try:
-        df = yf.download("ETH-USD", start=date_str, end=date_str, interval="1d", progress=False)
-        if not df.empty:
-            close_price = df["Close"].iloc[0]
-            price_decimal = Decimal(str(close_price)).quantize(Decimal("0.01"))
-            _price_cache[date_str] = price_decimal
-            return price_decimal
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        series = _load_eth_series(YF_START_DATE, today)
+        close_price = series.get(date_str)
+        if close_price is not None:
+            price = round(float(close_price), 2)
+            _price_cache[date_str] = _price_by_day[day] = price
+            _persist_learned_price(date_str, price)
+            return price
         else:
-            print(f"[red]❌ yfinance had no data for {date_str}[/red]")
+            log.error("yfinance had no data for %s", date_str)
     except Exception as e:
-        print(f"[red]❌ yfinance error on {date_str}: {e}[/red]")
+        log.error("yfinance error on %s: %s", date_str, e)
+
+    return 0.0
 
-    return Decimal("0.0")
+def get_prices_at_times(timestamps) -> "np.ndarray":
+    """
+    Vectorized get_price_at_time: float64 array aligned with `timestamps`.
+    Each distinct UTC day is looked up once, then broadcast back to every tx on that day.
+    """
+    import numpy as np
+    days = np.asarray(timestamps, dtype=np.int64) // 86400
+    unique_days, inverse = np.unique(days, return_inverse=True)
+    day_prices = np.fromiter(
+        (get_price_at_time(int(d) * 86400) for d in unique_days),
+        dtype=np.float64,
+        count=len(unique_days),
+    )
+    flush_learned_prices()  # one parquet write for the whole batch, not one per missed day
+    return day_prices[inverse]
 
 # -----------------------------
 # CURRENT PRICE FETCH
 # -----------------------------
-def fetch_current_eth_price() -> Decimal:
+def fetch_current_eth_price() -> float:
     """
     Fetches the current ETH price in USD from CryptoCompare.
     Falls back to 0.0 on failure.
@@ -145,12 +260,12 @@ def fetch_current_eth_price() -> Decimal:
     params = {"fsym": "ETH", "tsyms": "USD"}
     try:
         response = requests.get(url, params=params, timeout=10)
-        data = response.json()
+        data = orjson.loads(response.content)
         if "USD" in data:
-            return Decimal(str(data["USD"]))
+            return float(data["USD"])
         else:
-            print(f"[red]❌ Failed to fetch current ETH price: {data}[/red]")
-            return Decimal("0.0")
+            log.error("Failed to fetch current ETH price: %s", data)
+            return 0.0
     except Exception as e:
-        print(f"[red]❌ Error fetching current ETH price: {e}[/red]")
-        return Decimal("0.0")
+        log.error("Error fetching current ETH price: %s", e)
+        return 0.0
@@ -8,26 +8,26 @@ easy formatting, and integration with analytics (PnL, funding, etc).
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 
-@dataclass
+@dataclass(slots=True)
 class TokenTransfer:
     token: str  # Symbol, e.g. ETH, USDC
     amount: float
     from_addr: str
     to_addr: str
 
-@dataclass
+@dataclass(slots=True)
 class InternalTransfer:
     value_eth: float
     from_addr: str
     to_addr: str
 
-@dataclass
+@dataclass(slots=True)
 class GasInfo:
     gas_used: int
     gas_price_wei: int
     eth_spent: float  # Derived from used * price
 
-@dataclass
+@dataclass(slots=True)
 class ParsedTx:
     hash: str
     protocol: str  # e.g. Uniswap, 1inch, etc.
@@ -42,7 +42,7 @@ class ParsedTx:
 
     def summary(self):
         return {
-            "hash": self.hash[:10] + "...",
+            "hash": f"{self.hash[:10]}...",
             "protocol": self.protocol,
             "type": self.type,
             "tokens": self.tokens,
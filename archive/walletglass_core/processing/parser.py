@@ -14,37 +14,35 @@ Depends on:
 - common models (e.g. ParsedTx)
 """
 
-from alchemy import (
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from walletglass_core.ingestion.alchemy import (
     get_normal_transactions,
     get_transaction_receipt,
     get_internal_transactions,
     get_transaction,
+    batch_get_transactions,
 )
+from walletglass_core.processing.signature_map import bind_parsers, lookup
 
-# TEMP STUBS (replace with real imports later)
-from protocols.uniswap import parse_uniswap  # future path
-
-# -----------------------------
-# 🔁 Protocol Routing Logic
-# -----------------------------
-PROTOCOL_DECODERS = {
-    "Uniswap": parse_uniswap,  # Can expand with signature mapping
-    # "1inch": parse_1inch,
-    # "MetaMask": parse_metamask,
-}
+log = logging.getLogger(__name__)
 
 # -----------------------------
 # 🧠 Transaction Parser
 # -----------------------------
-def parse_transaction(tx_raw):
-    """Decode a single transaction by routing to the correct parser."""
-    # Placeholder: naive routing based on tx.to address or method
-    decoded_tx = get_transaction(tx_raw["hash"])
-    input_data = decoded_tx.get("input", "0x")
+def parse_transaction(tx_raw, decoded=None):
+    """
+    Decode a single transaction by routing to the correct parser.
+    `decoded` is the eth_getTransactionByHash result if the caller already batched it.
+    """
+    decoded_tx = decoded if decoded is not None else get_transaction(tx_raw["hash"])
+    decoded_tx = decoded_tx or {}
 
-    # Example: Uniswap check (to be replaced with real signature map)
-    if "0x" in input_data and "swap" in tx_raw.get("rawContract", {}).get("address", "").lower():
-        return parse_uniswap(tx_raw)
+    # One table probe: router address (V4, MetaMask) or 4-byte selector → parser
+    entry = lookup(decoded_tx.get("input", "0x"), decoded_tx.get("to"))
+    if entry and entry["parser"]:
+        return entry["parser"](tx_raw)
 
     return {
         "protocol": "Unknown",
@@ -55,18 +53,36 @@ def parse_transaction(tx_raw):
 # -----------------------------
 # 🧪 Wallet-Wide Parser
 # -----------------------------
+PARSE_MAX_WORKERS = 8  # per-protocol parsers may still hit the network (receipts, metadata)
+
 def parse_wallet(address):
     """Fetch and parse all transactions for a wallet."""
     raw_txs = get_normal_transactions(address)
-    parsed = []
 
-    for tx in raw_txs:
+    # One batched round-trip per RPC_BATCH_SIZE hashes instead of one get_transaction per tx
+    decoded_by_hash = batch_get_transactions(tx["hash"] for tx in raw_txs if tx.get("hash"))
+
+    errors = []  # (hash, message); list.append is atomic, reported once at the end
+
+    def parse_one(tx):
         try:
-            parsed_tx = parse_transaction(tx)
-            parsed.append(parsed_tx)
+            return parse_transaction(tx, decoded=decoded_by_hash.get(tx.get("hash")) or {})
         except Exception as e:
-            print(f"❌ Error parsing tx {tx['hash'][:10]}...: {e}")
+            errors.append((tx.get("hash"), str(e)))
+            return None
+
+    bind_parsers()  # build the routing tables before the workers start looking them up
+
+    # pool.map keeps the original tx order
+    with ThreadPoolExecutor(max_workers=PARSE_MAX_WORKERS, thread_name_prefix="wg-parse") as pool:
+        parsed = [p for p in pool.map(parse_one, raw_txs) if p is not None]
 
+    if errors:
+        log.warning(
+            "Failed to parse %d of %d txs: %s",
+            len(errors), len(raw_txs),
+            "; ".join(f"{str(h)[:10]}...: {msg}" for h, msg in errors[:20]),
+        )
     return parsed
 
 # Example for testing
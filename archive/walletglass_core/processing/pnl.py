@@ -1,43 +1,59 @@
+import logging
 from decimal import Decimal
 from typing import List, Dict
-from .transaction import Transaction
-from walletglass_core.pricing.pricing_engine import get_price_at_time, fetch_current_eth_price
+
+import numpy as np
+
+from .transaction import Transaction, address_bytes
+from walletglass_core.pricing.pricing_engine import get_prices_at_times, fetch_current_eth_price
 from datetime import datetime
 
+log = logging.getLogger(__name__)
+
 def calculate_eth_pnl(transactions: List[Transaction], wallet_address: str, placeholder_price: Decimal = Decimal("0.0")) -> Dict[str, Decimal]:
     """
     Calculate ETH received, sent, cost basis (historical), realized PnL,
     and compare to cost basis at today’s price.
+
+    Columnar: tx fields are staged into float64 / bool arrays and summed with NumPy;
+    Decimal is only used for the final quantized outputs.
     """
-    received = Decimal("0.0")
-    sent = Decimal("0.0")
-    cost_basis = Decimal("0.0")
-    realized_profit = Decimal("0.0")
+    wallet = address_bytes(wallet_address)
+    txs = [
+        tx for tx in transactions
+        if (not tx.token_symbol or tx.token_symbol == "ETH")
+        and (tx.from_bytes is None or tx.from_bytes != tx.to_bytes)  # skip self transfers (None never matches)
+    ]
+    n = len(txs)
 
-    for tx in transactions:
-        if tx.token_symbol and tx.token_symbol != "ETH":
-            continue
+    vals = np.fromiter((tx.value_eth_float for tx in txs), dtype=np.float64, count=n)
+    ts = np.fromiter((tx.ts_unix for tx in txs), dtype=np.int64, count=n)
+    known = wallet is not None  # a malformed wallet matches no tx (None == None must not count)
+    to_mask = np.fromiter((known and tx.to_bytes == wallet for tx in txs), dtype=bool, count=n)
+    from_mask = np.fromiter((known and tx.from_bytes == wallet for tx in txs), dtype=bool, count=n) & ~to_mask
 
-        if tx.from_address.lower() == tx.to_address.lower():
-            continue  # skip self transfers
+    prices = get_prices_at_times(ts)
+    priced = prices > 0  # pricing returns 0.0 on a miss (never NaN); NaN compares False too
+    if not priced.all():
+        log.warning("Skipping %d transactions — no price available", int((~priced).sum()))
+    to_mask &= priced
+    from_mask &= priced
 
-        eth_price = get_price_at_time(int(tx.timestamp.timestamp()))
+    # Running totals of buys; at a sell row these equal everything received before it
+    received_cum = np.cumsum(np.where(to_mask, vals, 0.0))
+    cost_cum = np.cumsum(np.where(to_mask, vals * prices, 0.0))
 
-        if eth_price is None:
-            print(f"[yellow]⚠ Skipping transaction at {tx.timestamp} — no price available[/yellow]")
-            continue
+    sells = from_mask & (received_cum > 0)
+    avg_cost = np.round(cost_cum[sells] / received_cum[sells], 2)
+    realized = float((vals[sells] * (prices[sells] - avg_cost)).sum())
 
-        if tx.to_address.lower() == wallet_address.lower():
-            received += tx.value_eth
-            cost_basis += tx.value_eth * eth_price
-        elif tx.from_address.lower() == wallet_address.lower():
-            if received > 0:
-                avg_cost = (cost_basis / received).quantize(Decimal("0.01"))
-                realized_profit += (tx.value_eth * eth_price) - (tx.value_eth * avg_cost)
-            sent += tx.value_eth
+    received = Decimal(str(float(vals[to_mask].sum())))
+    sent = Decimal(str(float(vals[from_mask].sum())))
+    cost_basis = Decimal(str(float((vals[to_mask] * prices[to_mask]).sum())))
+    realized_profit = Decimal(str(realized))
 
     # Fetch current ETH price for comparison
-    current_eth_price = fetch_current_eth_price()
+    current_eth_price = Decimal(str(fetch_current_eth_price()))
     current_cost_basis = received * current_eth_price
     unrealized_pnl = current_cost_basis - cost_basis
 
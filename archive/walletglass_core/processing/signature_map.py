@@ -4,8 +4,17 @@ Central routing map for identifying transaction type and protocol
 based on the first 4 bytes of calldata (function selector).
 
 Used by parser.py to delegate decoding to the correct module.
+
+SELECTOR_TABLE / ROUTER_TABLE are the merged, pre-keyed versions of every
+protocol's selector list (jargon: int / raw-bytes keys, one dict probe per tx)
+(plain: no per-tx string slicing, lowercasing or "swap" in ... scans).
 """
 
+import threading
+from types import MappingProxyType
+
+from walletglass_core.processing.transaction import address_bytes
+
 # Each entry maps 4-byte selector to:
 # - protocol name
 # - tx type (swap, fund, etc.)
@@ -27,10 +36,80 @@ signature_map = {
     # "0x095ea7b3": {"protocol": "ERC20", "type": "approve", "parser": None},
 }
 
+SELECTOR_TABLE = {}  # int(selector) → entry (jargon: uint32 keys hash in one step vs a 10-char str)
+ROUTER_TABLE = {}    # 20-byte `to` address → entry (routers identified by contract, not selector)
+
+
+def selector_int(input_data):
+    """4-byte function selector of a 0x calldata string as an int; -1 if there is none."""
+    if not input_data or len(input_data) < 10:
+        return -1
+    try:
+        return int(input_data[2:10], 16)
+    except ValueError:
+        return -1
+
+
+def int_keyed(selectors):
+    """Read-only copy of a {"0x…": value} selector dict keyed by int(selector)."""
+    return MappingProxyType({int(sel, 16): value for sel, value in selectors.items()})
+
+
+_bind_lock = threading.Lock()
+
+
 # Assign parser references at runtime (called from parser.py)
 def bind_parsers():
-    from walletglass_core.protocols import uniswap  # import here to avoid circular dependency
+    """
+    Bind parsers and build SELECTOR_TABLE / ROUTER_TABLE (once, thread-safe).
+    Both tables are built in locals and published together, so a concurrent
+    lookup() never sees a half-filled table.
+    """
+    global SELECTOR_TABLE, ROUTER_TABLE
+    if SELECTOR_TABLE:
+        return
+
+    with _bind_lock:
+        if SELECTOR_TABLE:  # another thread finished while we waited
+            return
+
+        # import here to avoid circular dependency
+        from walletglass_core.protocols import uniswap
+        from walletglass_core.swap import metamask, uniswap_v2, uniswap_v3
+
+        for selector in (*uniswap_v2.UNISWAP_V2_METHODS, *uniswap_v3.UNISWAP_V3_METHODS, *uniswap.UNISWAP_SELECTORS):
+            signature_map.setdefault(selector, {"protocol": "Uniswap", "type": "swap", "parser": None})
+
+        selectors = {}
+        for selector, entry in signature_map.items():
+            if entry["protocol"] == "Uniswap":
+                entry["parser"] = uniswap.parse_uniswap
+            selectors[int(selector, 16)] = entry
+
+        routers = {
+            uniswap.UNISWAP_V4_ROUTER_B: {
+                "protocol": "Uniswap", "type": "swap_v4", "parser": uniswap.parse_uniswap,
+            },
+            metamask.METAMASK_ROUTER_B: {
+                "protocol": "MetaMask", "type": "swap", "parser": metamask.parse_metamask_swap,
+            },
+        }
+
+        # ROUTER_TABLE first: a non-empty SELECTOR_TABLE is the "ready" signal
+        ROUTER_TABLE = routers
+        SELECTOR_TABLE = selectors
+
 
-    for selector, entry in signature_map.items():
-        if entry["protocol"] == "Uniswap":
-            entry["parser"] = uniswap.parse_uniswap
+def lookup(input_data, to_address=None):
+    """
+    Return the signature_map entry for a tx (router address first, then selector), or None.
+    A single dict probe per table beats a generated if/elif or match chain: CPython
+    compares `case` literals one by one, while dict.get is O(1) however many selectors we add.
+    """
+    if not SELECTOR_TABLE:
+        bind_parsers()
+    if to_address:
+        entry = ROUTER_TABLE.get(address_bytes(to_address))
+        if entry:
+            return entry
+    return SELECTOR_TABLE.get(selector_int(input_data))
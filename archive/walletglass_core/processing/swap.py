@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Swap:
     """Represents a token-to-token swap on-chain."""
     tx_hash: str
@@ -16,14 +16,15 @@ Currently assumes all swaps are ETH-based for valuation purposes.
 Used by: PnL engine, Streamlit frontend, AI summary generator.
 """
 
-from collections import defaultdict
 from decimal import Decimal
-from walletglass_core.pricing.pricing_engine import get_price_at_time, fetch_current_eth_price
+
+import numpy as np
+
+from walletglass_core.pricing.pricing_engine import get_prices_at_times, fetch_current_eth_price
 from walletglass_core.ingestion.etherscan import fetch_raw_eth_transactions
 from walletglass_core.processing.parser import parse_swap_events
 
-# 🔁 Replace stub with actual parser
-from walletglass_core.processing.parser import parse_swap_events as fetch_swap_events
+_DIRECTION_CODES = {"buy": 1, "sell": 2}
 
 
 def calculate_token_pnl(wallet_address: str) -> dict:
@@ -39,68 +40,69 @@ def calculate_token_pnl(wallet_address: str) -> dict:
 
     print(f"🔄 Decoded {len(swap_events)} swap events")
 
-    current_eth_price = fetch_current_eth_price()
-
-    token_data = defaultdict(lambda: {
-        "token_address": "",
-        "total_acquired": Decimal("0"),
-        "total_sold": Decimal("0"),
-        "invested_usd": Decimal("0"),
-        "proceeds_usd": Decimal("0"),
-        "txs": []
-    })
-
-    for tx in swap_events:
-        symbol = tx["token_symbol"]
-        token_address = tx["token_address"]
-        timestamp = tx["timestamp"]
-        amount = Decimal(str(tx["amount"]))
-        direction = tx["direction"]
-        pair_symbol = tx.get("pair_symbol", "ETH")  # default fallback
-
-        # For now we assume ETH-paired
-        price_usd = get_price_at_time(timestamp)
-        if price_usd is None or price_usd == Decimal("0.0"):
-            if direction in ("buy", "sell"):
-                print(f"[WARN] Missing price for {pair_symbol} at {timestamp}")
-            continue
-
-
-        token_data[symbol]["token_address"] = token_address
-
-        if direction == "buy":
-            token_data[symbol]["total_acquired"] += amount
-            token_data[symbol]["invested_usd"] += amount * price_usd
-        elif direction == "sell":
-            token_data[symbol]["total_sold"] += amount
-            token_data[symbol]["proceeds_usd"] += amount * price_usd
-
-        token_data[symbol]["txs"].append(tx)
+    current_eth_price = Decimal(str(fetch_current_eth_price()))  # pricing is float; Decimal at this boundary
+
+    # Price pre-pass: one lookup per distinct day, no per-event pricing calls in the aggregation
+    n = len(swap_events)
+    timestamps = np.fromiter((int(tx["timestamp"]) for tx in swap_events), dtype=np.int64, count=n)
+    prices = get_prices_at_times(timestamps)
+
+    # Events without a price are skipped (and reported) in one masked pass
+    priced = ~np.isnan(prices) & (prices != 0.0)
+    for i in np.flatnonzero(~priced):
+        tx = swap_events[i]
+        if tx["direction"] in ("buy", "sell"):
+            pair_symbol = tx.get("pair_symbol", "ETH")  # For now we assume ETH-paired
+            print(f"[WARN] Missing price for {pair_symbol} at {tx['timestamp']}")
+    events = [swap_events[i] for i in np.flatnonzero(priced)]
+    m = len(events)
+
+    # Struct-of-arrays: interned token id, amount, direction (1 = buy, 2 = sell, 0 = other)
+    token_ids = {}
+    ids = np.fromiter((token_ids.setdefault(tx["token_symbol"], len(token_ids)) for tx in events), dtype=np.int64, count=m)
+    amounts = np.fromiter((float(tx["amount"]) for tx in events), dtype=np.float64, count=m)
+    dirs = np.fromiter((_DIRECTION_CODES.get(tx["direction"], 0) for tx in events), dtype=np.int8, count=m)
+    token_address = {tx["token_symbol"]: tx["token_address"] for tx in events}  # last seen wins
+    usd = amounts * prices[priced]
+
+    # Per-token sums in one C pass each (jargon: bincount = grouped sum over int ids)
+    n_tokens = len(token_ids)
+    buys, sells = dirs == 1, dirs == 2
+    acquired_arr = np.bincount(ids[buys], weights=amounts[buys], minlength=n_tokens)
+    sold_arr = np.bincount(ids[sells], weights=amounts[sells], minlength=n_tokens)
+    invested_arr = np.bincount(ids[buys], weights=usd[buys], minlength=n_tokens)
+    proceeds_arr = np.bincount(ids[sells], weights=usd[sells], minlength=n_tokens)
+
+    # Derived columns and rounding on whole arrays; Decimal only when the result dict is built
+    eth_now = float(current_eth_price)
+    holding_arr = acquired_arr - sold_arr
+    realized_arr = proceeds_arr - invested_arr
+    unrealized_arr = holding_arr * eth_now
+    avg_buy_arr = np.divide(invested_arr, acquired_arr, out=np.zeros(n_tokens), where=acquired_arr > 0)
+    avg_sell_arr = np.divide(proceeds_arr, sold_arr, out=np.zeros(n_tokens), where=sold_arr > 0)
+
+    columns = {
+        "total_acquired": np.round(acquired_arr, 4),
+        "total_sold": np.round(sold_arr, 4),
+        "net_holding": np.round(holding_arr, 4),
+        "avg_buy_price_usd": np.round(avg_buy_arr, 8),
+        "avg_sell_price_usd": np.round(avg_sell_arr, 8),
+        "total_invested_usd": np.round(invested_arr, 2),
+        "total_proceeds_usd": np.round(proceeds_arr, 2),
+        "realized_pnl_usd": np.round(realized_arr, 2),
+        "unrealized_value_usd": np.round(unrealized_arr, 2),
+        "net_pnl_after_gas_usd": np.round(realized_arr + unrealized_arr, 2),  # placeholder; subtract gas later
+    }
+    columns = {name: [Decimal(str(v)) for v in col.tolist()] for name, col in columns.items()}
 
     results = {}
-    for symbol, data in token_data.items():
-        acquired = data["total_acquired"]
-        sold = data["total_sold"]
-        invested = data["invested_usd"]
-        proceeds = data["proceeds_usd"]
-        holding = acquired - sold
-        realized_pnl = proceeds - invested
-        unrealized_value = holding * current_eth_price
-        net_pnl = realized_pnl + unrealized_value
-
-        results[symbol] = {
-            "symbol": symbol,
-            "token_address": data["token_address"],
-            "total_acquired": round(acquired, 4),
-            "total_sold": round(sold, 4),
-            "net_holding": round(holding, 4),
-            "avg_buy_price_usd": round(invested / acquired, 8) if acquired > 0 else 0,
-            "avg_sell_price_usd": round(proceeds / sold, 8) if sold > 0 else 0,
-            "total_invested_usd": round(invested, 2),
-            "total_proceeds_usd": round(proceeds, 2),
-            "realized_pnl_usd": round(realized_pnl, 2),
-            "unrealized_value_usd": round(unrealized_value, 2),
-            "net_pnl_after_gas_usd": round(net_pnl, 2),  # placeholder; subtract gas later
-        }
+    for symbol, tid in token_ids.items():
+        results[symbol] = {"symbol": symbol, "token_address": token_address[symbol]}
+        for name, col in columns.items():
+            results[symbol][name] = col[tid]
+        if acquired_arr[tid] <= 0:
+            results[symbol]["avg_buy_price_usd"] = 0
+        if sold_arr[tid] <= 0:
+            results[symbol]["avg_sell_price_usd"] = 0
 
     return results
@@ -1,9 +1,11 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
 from decimal import Decimal
 from datetime import datetime
 
-@dataclass
+import numpy as np
+
+@dataclass(slots=True)
 class Transaction:
     """Base class for a blockchain transaction."""
     tx_hash: str
@@ -17,7 +19,75 @@ class Transaction:
     token_amount: Optional[Decimal] = None
     token_address: Optional[str] = None
     tx_type: Optional[str] = None  # e.g. 'swap', 'send', 'receive'
+    value_wei: Optional[int] = None  # exact integer value when the source provides it
+    gas_price_wei: Optional[int] = None  # exact integer gas price when the source provides it
+    from_bytes: Optional[bytes] = field(init=False, repr=False, compare=False)
+    to_bytes: Optional[bytes] = field(init=False, repr=False, compare=False)
+    ts_unix: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Normalized once here so comparisons downstream are plain bytes == (no per-use .lower());
+        # None marks a missing/malformed address and must be checked before comparing
+        self.from_bytes = address_bytes(self.from_address)
+        self.to_bytes = address_bytes(self.to_address)
+        self.ts_unix = int(self.timestamp.timestamp())
+
+    @property
+    def value_eth_float(self) -> float:
+        """value_eth as a float for arithmetic hot paths (Decimal stays the I/O representation)."""
+        if self.value_wei is not None:
+            return self.value_wei / 1e18
+        return float(self.value_eth)
+
+    def gas_cost_eth(self) -> float:
+        """Calculate total gas cost in ETH (int wei math when available; wrap in Decimal at report time)."""
+        if self.gas_price_wei is not None:
+            return (self.gas_used * self.gas_price_wei) / 1e18
+        return self.gas_used * float(self.gas_price_gwei) / 1e9
+
+
+def address_bytes(address: Optional[str]) -> Optional[bytes]:
+    """20-byte form of a 0x address (case-insensitive); None for missing or malformed addresses."""
+    if not address or len(address) != 42:
+        return None
+    try:
+        return bytes.fromhex(address[2:])
+    except ValueError:
+        return None
+
+
+def address_key(address: Optional[str]) -> Optional[int]:
+    """Last 64 bits of an address as an int (case-insensitive); None wherever address_bytes is None."""
+    b = address_bytes(address)
+    return int.from_bytes(b[12:], "big") if b is not None else None
+
+
+def _key_column(addresses: List[Optional[str]]):
+    """(uint64 keys, valid mask) for a column of addresses; invalid rows hold 0 and must be masked out."""
+    keys = [address_key(a) for a in addresses]
+    n = len(keys)
+    valid = np.fromiter((k is not None for k in keys), dtype=bool, count=n)
+    hashed = np.fromiter((k or 0 for k in keys), dtype=np.uint64, count=n)
+    return hashed, valid
+
+
+class TransactionBatch:
+    """
+    Struct-of-arrays view over a list of Transactions, for vectorized filters.
+    Addresses are hashed once to uint64 so comparisons become one NumPy pass;
+    from_valid / to_valid flag the rows whose address parsed (the rest never match).
+    """
+
+    def __init__(self, transactions: Iterable[Transaction]):
+        self.transactions: List[Transaction] = list(transactions)
+        n = len(self.transactions)
+        self.values = np.fromiter((tx.value_eth_float for tx in self.transactions), dtype=np.float64, count=n)
+        self.from_hash, self.from_valid = _key_column([tx.from_address for tx in self.transactions])
+        self.to_hash, self.to_valid = _key_column([tx.to_address for tx in self.transactions])
+
+    def __len__(self) -> int:
+        return len(self.transactions)
 
-    def gas_cost_eth(self) -> Decimal:
-        """Calculate total gas cost in ETH."""
-        return Decimal(self.gas_used) * self.gas_price_gwei / Decimal(1_000_000_000)
\ No newline at end of file
+    def select(self, mask: np.ndarray) -> List[Transaction]:
+        """Transactions where mask is True, in original order."""
+        return [self.transactions[i] for i in np.flatnonzero(mask)]
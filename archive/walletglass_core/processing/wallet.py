@@ -1,7 +1,6 @@
 from dataclasses import dataclass, field
 from typing import List
-from decimal import Decimal
-from .transaction import Transaction
+from .transaction import Transaction, address_bytes
 
 
 @dataclass
@@ -10,9 +9,12 @@ class Wallet:
     address: str
     transactions: List[Transaction] = field(default_factory=list)
 
-    def total_gas_eth(self) -> Decimal:
-        return sum(tx.gas_cost_eth() for tx in self.transactions)
+    def total_gas_eth(self) -> float:
+        return sum((tx.gas_cost_eth() for tx in self.transactions), 0.0)
 
     def funding_events(self) -> List[Transaction]:
         """Return transactions that are funding (e.g., large incoming transfers)."""
-        return [tx for tx in self.transactions if tx.to_address.lower() == self.address.lower() and tx.value_eth > Decimal("0.01")]
\ No newline at end of file
+        wallet = address_bytes(self.address)
+        if wallet is None:
+            return []
+        return [tx for tx in self.transactions if tx.to_bytes == wallet and tx.value_eth_float > 0.01]
\ No newline at end of file
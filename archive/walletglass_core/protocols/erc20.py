@@ -7,41 +7,42 @@ Returns a list of TokenTransfer objects for use in funding, balance tracking, an
 from walletglass_core.processing.models import TokenTransfer
 
 # ERC20 Transfer event signature hash
+# JSON-RPC returns topics as canonical lowercase hex, so an exact compare is enough (no per-log .lower())
 TRANSFER_EVENT_SIG = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+TRANSFER_EVENT_SIG_B = bytes.fromhex(TRANSFER_EVENT_SIG[2:])  # for callers holding raw 32-byte topics
+
+
+def _is_transfer_log(log):
+    topics = log.get("topics")
+    return bool(topics) and len(topics) >= 3 and topics[0] == TRANSFER_EVENT_SIG
 
 # -----------------------------
 # 🧮 Decode Transfer Logs
 # -----------------------------
-def extract_erc20_transfers(logs):
+def iter_erc20_transfers(logs):
     """
-    Extracts ERC20 Transfer events from logs.
-    Assumes logs are already pulled from Alchemy receipt.
+    Lazily yield TokenTransfer objects for the ERC20 Transfer events in `logs`.
+    Streaming consumers never hold the full list; they can also stop early.
     """
-    transfers = []
-
-    for log in logs:
-        if log.get("topics", [])[0].lower() != TRANSFER_EVENT_SIG:
-            continue  # Not a Transfer event
-
-        if len(log["topics"]) < 3:
-            continue  # Malformed event
-
+    # Pre-filter: Transfer events with from/to topics (others / malformed are skipped)
+    for log in filter(_is_transfer_log, logs):
         try:
-            from_addr = f"0x{log['topics'][1][-40:]}"
-            to_addr = f"0x{log['topics'][2][-40:]}"
-            raw_value = int(log["data"], 16)
-            token_address = log["address"]
-            token_symbol = "UNKNOWN"  # TODO: resolve symbol from cache or metadata
-            value = raw_value / (10 ** 18)  # NOTE: assumes 18 decimals for now
-
-            transfers.append(TokenTransfer(
-                token=token_symbol,
-                amount=value,
-                from_addr=from_addr,
-                to_addr=to_addr
-            ))
+            topics = log["topics"]
+            raw_value = int(log["data"], 16) if len(log["data"]) > 2 else 0
+            yield TokenTransfer(
+                token="UNKNOWN",  # TODO: resolve symbol from cache or metadata
+                amount=raw_value / 10 ** 18,  # NOTE: assumes 18 decimals for now
+                from_addr=f"0x{topics[1][-40:]}",
+                to_addr=f"0x{topics[2][-40:]}",
+            )
         except Exception as e:
             print(f"⚠️ Failed to decode ERC20 transfer: {e}")
             continue
 
-    return transfers
+
+def extract_erc20_transfers(logs):
+    """
+    Extracts ERC20 Transfer events from logs.
+    Assumes logs are already pulled from Alchemy receipt.
+    """
+    return list(iter_erc20_transfers(logs))
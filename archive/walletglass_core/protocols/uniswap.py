@@ -7,6 +7,8 @@ Returns a ParsedTx object for consistency across the WalletGlass pipeline.
 """
 
 from walletglass_core.processing.models import ParsedTx, TokenTransfer
+from walletglass_core.processing.transaction import address_bytes
+from walletglass_core.processing.signature_map import int_keyed, selector_int
 
 # Known 4-byte function selectors for Uniswap V2 & V3 swaps
 UNISWAP_SELECTORS = {
@@ -18,7 +20,10 @@ UNISWAP_SELECTORS = {
     "0xb858183f": "exactInput",                 # V3 multi-hop
 }
 
+UNISWAP_SELECTORS_INT = int_keyed(UNISWAP_SELECTORS)
+
 UNISWAP_V4_ROUTER = "0xef1c6e67703c7bd7107eed8303fbe6ec2554bf6b"  # Canonical V4 singleton router
+UNISWAP_V4_ROUTER_B = address_bytes(UNISWAP_V4_ROUTER)
 
 # Placeholder symbol resolution (mock)
 def resolve_token_symbol(address):
@@ -41,11 +46,10 @@ def parse_uniswap(tx_raw):
         - 'rawInput': hex calldata string
     """
     tx_hash = tx_raw.get("hash")
-    to_addr = tx_raw.get("to", "").lower()
-    method_id = tx_raw.get("rawInput", "0x")[:10]
+    method_id = selector_int(tx_raw.get("rawInput"))
 
     # V4 basic detection via singleton router
-    if to_addr == UNISWAP_V4_ROUTER:
+    if address_bytes(tx_raw.get("to")) == UNISWAP_V4_ROUTER_B:
         return ParsedTx(
             hash=tx_hash,
             protocol="Uniswap",
@@ -58,7 +62,7 @@ def parse_uniswap(tx_raw):
         )
 
     # Handle V2/V3 via selector
-    if method_id not in UNISWAP_SELECTORS:
+    if method_id not in UNISWAP_SELECTORS_INT:
         raise ValueError("Unknown Uniswap method selector")
 
     token_symbols, amounts = decode_swap_amounts([])  # logs passed in later
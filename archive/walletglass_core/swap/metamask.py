@@ -6,8 +6,11 @@ Future versions will parse logs to extract actual swap details.
 
 from typing import Dict, Any
 
+from walletglass_core.processing.transaction import address_bytes
+
 # MetaMask Swaps contract address (mainnet)
 METAMASK_ROUTER = "0x881d40237659c251811cec9c364ef91dc08d300c".lower()
+METAMASK_ROUTER_B = address_bytes(METAMASK_ROUTER)
 
 
 def is_metamask_swap(tx: Dict[str, Any]) -> bool:
@@ -20,8 +23,7 @@ def is_metamask_swap(tx: Dict[str, Any]) -> bool:
     Returns:
         True if it's a MetaMask swap, False otherwise.
     """
-    to_address = tx.get("to", "").lower()
-    return to_address == METAMASK_ROUTER
+    return address_bytes(tx.get("to")) == METAMASK_ROUTER_B
 
 
 def parse_metamask_swap(tx: Dict[str, Any]) -> Dict[str, Any]:
@@ -9,6 +9,8 @@ if the method signature matches a known Uniswap V2 method ID.
 To be replaced with real decoding logic in future iterations.
 """
 
+from walletglass_core.processing.signature_map import int_keyed, selector_int
+
 # Known Uniswap V2 method IDs
 UNISWAP_V2_METHODS = {
     "0x38ed1739": "swapExactTokensForTokens",
@@ -16,6 +18,7 @@ UNISWAP_V2_METHODS = {
     "0x7ff36ab5": "swapExactETHForTokensSupportingFeeOnTransferTokens",
     "0x5c11d795": "swapTokensForExactETH",
 }
+UNISWAP_V2_SELECTORS = int_keyed(UNISWAP_V2_METHODS)
 
 def is_uniswap_v2_swap(input_data: str) -> bool:
     """
@@ -27,7 +30,7 @@ def is_uniswap_v2_swap(input_data: str) -> bool:
     Returns:
         bool: True if it matches a known Uniswap V2 swap method
     """
-    return input_data[:10] in UNISWAP_V2_METHODS
+    return selector_int(input_data) in UNISWAP_V2_SELECTORS
 
 def parse_uniswap_v2_swap(tx: dict) -> dict:
     """
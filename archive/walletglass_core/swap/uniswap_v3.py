@@ -9,11 +9,14 @@ for any transaction matching a Uniswap V3 method signature.
 Full ABI decoding will be added later using eth_abi.
 """
 
+from walletglass_core.processing.signature_map import int_keyed, selector_int
+
 # Known Uniswap V3 method IDs
 UNISWAP_V3_METHODS = {
     "0x414bf389": "exactInputSingle",
     "0xb858183f": "exactInput",
 }
+UNISWAP_V3_SELECTORS = int_keyed(UNISWAP_V3_METHODS)
 
 def is_uniswap_v3_swap(input_data: str) -> bool:
     """
@@ -25,7 +28,7 @@ def is_uniswap_v3_swap(input_data: str) -> bool:
     Returns:
         bool: True if it matches a known Uniswap V3 method
     """
-    return input_data[:10] in UNISWAP_V3_METHODS
+    return selector_int(input_data) in UNISWAP_V3_SELECTORS
 
 def parse_uniswap_v3_swap(tx: dict) -> dict:
     """
@@ -4,29 +4,36 @@ Loads token symbol and decimals from a local JSON cache.
 Fallback support can be added later using on-chain Alchemy calls.
 """
 
-import json
 import os
+import orjson
 
 # Assumes file is stored at walletglass_core/data/token_metadata.json
 TOKEN_METADATA_PATH = os.path.join(os.path.dirname(__file__), '../data/token_metadata.json')
 
+_META_CACHE = None  # parsed once per process (after the first successful read), keys lowercased at load
+
 # -----------------------------
 # 🔎 Load Metadata from JSON
 # -----------------------------
 def load_token_metadata():
+    global _META_CACHE
+    if _META_CACHE is not None:
+        return _META_CACHE
     try:
-        with open(TOKEN_METADATA_PATH, 'r') as f:
-            return json.load(f)
+        with open(TOKEN_METADATA_PATH, 'rb') as f:
+            raw = orjson.loads(f.read())
+        _META_CACHE = {addr.lower(): entry for addr, entry in raw.items()}
     except Exception as e:
         print(f"⚠️ Failed to load token metadata: {e}")
-        return {}
+        return {}  # not cached: the next call retries the read
+    return _META_CACHE
 
 # -----------------------------
 # 🔖 Resolve Metadata by Address
 # -----------------------------
 def resolve_token_metadata(address):
     metadata = load_token_metadata()
-    entry = metadata.get(address.lower())
+    entry = metadata.get(address) or metadata.get(address.lower())  # lowercase input skips the .lower()
     if entry:
         return {
             "symbol": entry.get("symbol", "UNKNOWN"),
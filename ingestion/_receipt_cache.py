@@ -0,0 +1,68 @@
+"""
+_receipt_cache.py — On-disk store of finalized eth_getTransactionReceipt results.
+
+Receipts of mined transactions never change, so once a tx is FINALITY_CONFIRMATIONS
+blocks deep its receipt is kept here and repeat ingests skip the network for it.
+Younger receipts are not stored (plain: a reorg could still replace them).
+
+Store: data/receipt_cache.sqlite  (tx_hash → receipt JSON)
+Used by: alchemy_adapter.py
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable
+
+import orjson
+
+CACHE_PATH = Path(__file__).resolve().parent.parent / "data" / "receipt_cache.sqlite"
+FINALITY_CONFIRMATIONS = 12
+
+_lock = threading.Lock()
+_conn = None  # one connection per process, only used under _lock
+
+
+def _connect() -> sqlite3.Connection:
+    """Shared connection, opened on first use (plain: no open/close per single-receipt lookup)."""
+    global _conn
+    if _conn is None:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _conn.execute("CREATE TABLE IF NOT EXISTS receipts (tx_hash TEXT PRIMARY KEY, body BLOB)")
+    return _conn
+
+
+def get_many(tx_hashes: Iterable[str]) -> Dict[str, dict]:
+    """Cached receipts for the given hashes (misses are simply absent)."""
+    keys = [h.lower() for h in tx_hashes]
+    found = {}
+    try:
+        with _lock, _connect() as conn:
+            for start in range(0, len(keys), 500):  # stay under SQLite's bound-parameter limit
+                chunk = keys[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                for tx_hash, body in conn.execute(
+                    f"SELECT tx_hash, body FROM receipts WHERE tx_hash IN ({marks})", chunk
+                ):
+                    found[tx_hash] = orjson.loads(body)
+    except Exception as e:
+        print(f"[warn] receipt cache read failed: {e}")
+    return found
+
+
+def put_many(receipts: Dict[str, dict], latest_block: int) -> None:
+    """Store receipts that are at least FINALITY_CONFIRMATIONS blocks below latest_block."""
+    safe_block = latest_block - FINALITY_CONFIRMATIONS
+    rows = [
+        (tx_hash.lower(), orjson.dumps(receipt))
+        for tx_hash, receipt in receipts.items()
+        if receipt and receipt.get("blockNumber") and int(receipt["blockNumber"], 16) <= safe_block
+    ]
+    if not rows:
+        return
+    try:
+        with _lock, _connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO receipts (tx_hash, body) VALUES (?, ?)", rows)
+    except Exception as e:
+        print(f"[warn] receipt cache write failed: {e}")
@@ -6,7 +6,7 @@ Handles fetching raw transaction and log data from Alchemy using their JSON-RPC
 Functions:
 - fetch_transfers(address): Get all asset transfers for a wallet.
 - fetch_tx_receipt(tx_hash): Get detailed logs for a specific transaction.
-- fetch_txs_and_logs(address): Master function that returns both transfers and logs.
+- fetch_txs_and_logs(address): Master generator yielding each transfer with its receipt logs.
 
 Requirements:
 - Set ALCHEMY_API_KEY in your .env file
@@ -17,11 +17,22 @@ Usage:
 
 import os
 import time
+import logging
+import asyncio
+import orjson
+from typing import Iterator
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+from ingestion import _receipt_cache
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Alchemy endpoint and key
 ALCHEMY_API_KEY = os.getenv("ALCHEMY_API_KEY")
 if not ALCHEMY_API_KEY:
@@ -30,91 +41,223 @@ if not ALCHEMY_API_KEY:
 ALCHEMY_BASE_URL = "https://eth-mainnet.g.alchemy.com/v2"
 ALCHEMY_URL = f"{ALCHEMY_BASE_URL}/{ALCHEMY_API_KEY}"  # This is the full URL we POST to
 
+# Persistent session: keep-alive reuses pooled TLS connections instead of a handshake per call
+_SESSION = requests.Session()
+_SESSION.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip"})
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 502, 503, 504), allowed_methods=None),
+))
+
+
+TRANSFER_CATEGORIES = ("external", "erc20", "erc721")
+TRANSFER_PAGE_SIZE = "0x3e8"  # 1000, Alchemy's max per page; pageKey carries the cursor
+
+
+def _query_transfers(address: str, direction: str, category: str) -> list:
+    """All pages of one (direction, category) cursor."""
+    key = "toAddress" if direction == "to" else "fromAddress"
+    params = {
+        "fromBlock": "0x0",
+        "toBlock": "latest",
+        "withMetadata": True,
+        "excludeZeroValue": False,
+        "maxCount": TRANSFER_PAGE_SIZE,
+        "category": [category],
+        key: address,
+    }
+    transfers = []
+    while True:
+        payload = {"jsonrpc": "2.0", "id": 1, "method": "alchemy_getAssetTransfers", "params": [params]}
+        response = _SESSION.post(ALCHEMY_URL, json=payload)
+        response.raise_for_status()
+        result = orjson.loads(response.content).get("result", {})
+        transfers.extend(result.get("transfers", []))
+        page_key = result.get("pageKey")
+        if not page_key:
+            return transfers
+        params = {**params, "pageKey": page_key}
+
 
 def fetch_transfers(address: str) -> list:
     """
     Fetch all ETH and token transfers involving the given address.
     Alchemy treats toAddress+fromAddress as AND filter — so we query separately and merge.
+    Each direction × category cursor is paged to the end, all six concurrently.
     """
     print(f"🔍 Fetching transfers for: {address}")
 
-    def query(direction: str):
-        key = "toAddress" if direction == "to" else "fromAddress"
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "alchemy_getAssetTransfers",
-            "params": [{
-                "fromBlock": "0x0",
-                "toBlock": "latest",
-                "withMetadata": True,
-                "excludeZeroValue": False,
-                "maxCount": "0x3e8",
-                "category": ["external", "erc20", "erc721"],
-                key: address
-            }]
-        }
-        response = requests.post(ALCHEMY_URL, json=payload)
-        response.raise_for_status()
-        result = response.json().get("result", {})
-        return result.get("transfers", [])
+    jobs = [(d, c) for d in ("to", "from") for c in TRANSFER_CATEGORIES]
+    with ThreadPoolExecutor(max_workers=len(jobs)) as ex:
+        pages = list(ex.map(lambda job: _query_transfers(address, *job), jobs))
 
-    # Fetch both incoming and outgoing separately
-    to_transfers = query("to")
-    from_transfers = query("from")
+    # Merge, dropping the duplicate a self-transfer produces (it matches both directions)
+    combined, seen = [], set()
+    counts = {"to": 0, "from": 0}
+    for (direction, _), transfers in zip(jobs, pages):
+        counts[direction] += len(transfers)
+        for t in transfers:
+            uid = t.get("uniqueId") or (t.get("hash"), t.get("category"), t.get("from"), t.get("to"), t.get("value"))
+            if uid not in seen:
+                seen.add(uid)
+                combined.append(t)
 
-    combined = to_transfers + from_transfers
-    print(f"✅ Fetched {len(combined)} transfers (🔼{len(from_transfers)} out, 🔽{len(to_transfers)} in)")
+    print(f"✅ Fetched {len(combined)} transfers (🔼{counts['from']} out, 🔽{counts['to']} in)")
     return combined
 
 
+HEAD_BLOCK_MAX_AGE_S = 12  # one slot; an older head only makes the finality cut more conservative
+_head = (0.0, 0)           # (monotonic fetched_at, block number)
+
+
+def fetch_latest_block(max_age: float = HEAD_BLOCK_MAX_AGE_S) -> int:
+    """
+    Current head block number (used to decide which receipts are final enough to cache).
+    Reused for max_age seconds, so per-receipt callers don't pay an eth_blockNumber each.
+    """
+    global _head
+    fetched_at, block = _head
+    if block and time.monotonic() - fetched_at < max_age:
+        return block
+    response = _SESSION.post(ALCHEMY_URL, json={"jsonrpc": "2.0", "id": 1, "method": "eth_blockNumber", "params": []})
+    response.raise_for_status()
+    block = int(orjson.loads(response.content)["result"], 16)
+    _head = (time.monotonic(), block)
+    return block
+
+
+def _store_receipts(receipts: dict) -> None:
+    try:
+        _receipt_cache.put_many(receipts, fetch_latest_block())
+    except Exception as e:
+        print(f"[warn] could not cache receipts: {e}")
+
 
 def fetch_tx_receipt(tx_hash: str) -> dict:
+    cached = _receipt_cache.get_many([tx_hash]).get(tx_hash.lower())
+    if cached is not None:
+        return cached
+
     payload = {
         "jsonrpc": "2.0",
         "id": 1,
         "method": "eth_getTransactionReceipt",
         "params": [tx_hash]
     }
-    response = requests.post(ALCHEMY_URL, json=payload)
+    response = _SESSION.post(ALCHEMY_URL, json=payload)
     response.raise_for_status()
-    data = response.json()
+    data = orjson.loads(response.content)
 
-    # DEBUGGING HERE 👇
-    print(f"🔍 Receipt for {tx_hash[:10]}...: ", "logs" in data.get("result", {}))
+    logger.debug("Receipt for %s...: has logs=%s", tx_hash[:10], "logs" in (data.get("result") or {}))
 
+    _store_receipts({tx_hash: data["result"]})
     return data["result"]
 
 
 
-def fetch_txs_and_logs(address: str) -> list:
-    print(f"🔍 Fetching transfers for: {address}")
-    transfers = fetch_transfers(address)
-    print(f"✅ Fetched {len(transfers)} transfers (🔼{sum(1 for t in transfers if t['category'] == 'external' and t['from'].lower() == address.lower())} out, 🔽{sum(1 for t in transfers if t['to'].lower() == address.lower())} in)")
+# ----------------------------------------
+# ⚡ Batched + concurrent receipt fetching
+# ----------------------------------------
+RECEIPT_BATCH_SIZE = 100       # receipts per JSON-RPC batch POST
+RECEIPT_MAX_CONCURRENCY = 10   # batch POSTs in flight at once (stay under Alchemy's CU/s limit)
+RECEIPT_MAX_RETRIES = 4        # attempts per batch when Alchemy answers 429
+RECEIPT_TIMEOUT_S = 20         # seconds per batch POST, connect included
+
+
+def _receipt_batch_payload(tx_hashes: list) -> list:
+    return [
+        {"jsonrpc": "2.0", "id": i, "method": "eth_getTransactionReceipt", "params": [h]}
+        for i, h in enumerate(tx_hashes)
+    ]
+
+
+def _receipts_by_id(items) -> dict:
+    """Batch replies can arrive in any order; index results by request id (None if that call errored)."""
+    if not isinstance(items, list):
+        # a whole-batch failure comes back as one JSON-RPC error object, not a list of replies
+        error = items.get("error", items) if isinstance(items, dict) else items
+        raise RuntimeError(f"Alchemy batch RPC failed: {error}")
+    return {item.get("id"): item.get("result") for item in items}
 
-    results = []
 
-    for transfer in transfers:
-        tx_hash = transfer["hash"]
-        try:
-            receipt = fetch_tx_receipt(tx_hash)
+async def _afetch_receipt_batch(session, sem, tx_hashes: list) -> list:
+    payload = _receipt_batch_payload(tx_hashes)
+    delay = 0.5
+    async with sem:
+        for attempt in range(RECEIPT_MAX_RETRIES):
+            async with session.post(ALCHEMY_URL, json=payload) as response:
+                if response.status == 429 and attempt < RECEIPT_MAX_RETRIES - 1:
+                    await asyncio.sleep(delay)  # (jargon: exponential backoff) (plain: wait longer each retry)
+                    delay *= 2
+                    continue
+                response.raise_for_status()
+                by_id = _receipts_by_id(orjson.loads(await response.read()))
+                return [by_id.get(i) for i in range(len(tx_hashes))]
+
+
+async def _gather_receipts(tx_hashes: list) -> list:
+    """
+    Receipts in the same order as tx_hashes: RECEIPT_BATCH_SIZE hashes per POST, batches sent concurrently.
+    Hashes from a failed batch come back as that batch's exception; missing receipts as None.
+    """
+    import aiohttp  # only needed for the bulk path
+
+    sem = asyncio.Semaphore(RECEIPT_MAX_CONCURRENCY)
+    chunks = [tx_hashes[i:i + RECEIPT_BATCH_SIZE] for i in range(0, len(tx_hashes), RECEIPT_BATCH_SIZE)]
+    # One keep-alive socket per in-flight batch, reused across batches (plain: no handshake per POST)
+    connector = aiohttp.TCPConnector(limit=RECEIPT_MAX_CONCURRENCY, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=RECEIPT_TIMEOUT_S)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        batches = await asyncio.gather(
+            *(_afetch_receipt_batch(session, sem, c) for c in chunks),
+            return_exceptions=True,
+        )
+    receipts = []
+    for chunk, batch in zip(chunks, batches):
+        receipts.extend([batch] * len(chunk) if isinstance(batch, Exception) else batch)
+    return receipts
 
-            result = {
+
+def fetch_txs_and_logs(address: str) -> Iterator[dict]:
+    """
+    Yields one {tx_hash, from, to, value, asset, category, timestamp, logs} dict per transfer.
+    Lazy (plain: nothing is fetched until the caller starts iterating, and the
+    per-tx dicts are never all held at once); the summary prints when iteration ends.
+    """
+    transfers = fetch_transfers(address)  # logs its own "🔍 Fetching" / "✅ Fetched N (out, in)" lines
+
+    # Finalized receipts come from disk; only the misses go to Alchemy
+    hashes = [t["hash"] for t in transfers]
+    cached = _receipt_cache.get_many(hashes)
+    misses = list(dict.fromkeys(h for h in hashes if h.lower() not in cached))
+    fetched = dict(zip(misses, asyncio.run(_gather_receipts(misses)))) if misses else {}
+    if fetched:
+        _store_receipts({h: r for h, r in fetched.items() if not isinstance(r, Exception)})
+    receipts = [cached.get(h.lower(), fetched.get(h)) for h in hashes]
+    print(f"💾 {len(hashes) - len(misses)} receipts from cache, {len(misses)} fetched")
+
+    n_txs = n_logs = 0
+    try:
+        for transfer, receipt in zip(transfers, receipts):
+            tx_hash = transfer["hash"]
+            if isinstance(receipt, Exception) or receipt is None:
+                print(f"⚠️ Error fetching logs for {tx_hash[:10]}...: {receipt or 'no receipt returned'}")
+                continue
+
+            logs = receipt.get("logs", [])
+            n_txs += 1
+            n_logs += len(logs)
+            yield {
                 "tx_hash": tx_hash,
                 "from": transfer.get("from"),
                 "to": transfer.get("to"),
                 "value": transfer.get("value"),
                 "asset": transfer.get("asset"),
                 "category": transfer.get("category"),
-                "timestamp": transfer.get("metadata", {}).get("blockTimestamp"),
-                "logs": receipt.get("logs", []),
+                "timestamp": (transfer.get("metadata") or {}).get("blockTimestamp"),
+                "logs": logs,
             }
-
-            results.append(result)
-
-        except Exception as e:
-            print(f"⚠️ Error fetching logs for {tx_hash[:10]}...: {e}")
-
-    print(f"🧾 Retrieved logs for {len(results)} transactions")
-    print(f"🧪 Raw logs retrieved: {sum(len(tx['logs']) for tx in results)}")
-    return results
+    finally:
+        print(f"🧾 Retrieved logs for {n_txs} transactions")
+        print(f"🧪 Raw logs retrieved: {n_logs}")
@@ -5,13 +5,19 @@ Inspects log topic0 and dispatches to the appropriate decoder module.
 Logs unknown events.
 """
 
+import logging
 from typing import List, Dict, Any
 from ingestion.decoder_modules.transfer import decode_transfer
 from ingestion.decoder_modules.uniswap_v3 import decode_uniswap_v3
 
+logger = logging.getLogger(__name__)
+
+ERC20_TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
 # Map of known topic0 → decoder function
+# Keys are lowercase: JSON-RPC returns topics as canonical lowercase hex, so no per-log .lower()
 TOPIC0_DECODERS = {
-    "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef": decode_transfer,  # ERC20/721 Transfer
+    ERC20_TRANSFER_TOPIC: decode_transfer,  # ERC20/721 Transfer
     "0xd78ad95fa46c994b6551d0da85fc275fe613ce37657fb8d5e3d130840159d822": decode_uniswap_v3
 
 }
@@ -19,23 +25,50 @@ TOPIC0_DECODERS = {
 def decode_logs(logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Decodes a list of logs. Returns a list of decoded event dicts.
-    Unknown logs are skipped with a warning.
+    Unknown and malformed logs are skipped and counted (one summary line each, no per-log output).
+    Logs may come from any mix of receipts; each log keeps its own blockNumber.
     """
     decoded_events = []
+    unknown = 0
+    malformed = 0
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    # Logs of one receipt share a block: only re-parse the hex when it changes from the previous log
+    block_hex, block_num = None, 0
 
     for log in logs:
-        topic0 = log.get("topics", [None])[0]
+        topics = log.get("topics")
+        topic0 = topics[0] if topics else None  # [] / null topics: nothing to route on
         if not topic0:
             continue
 
-        decoder = TOPIC0_DECODERS.get(topic0.lower())
+        # Fast path: Transfer is by far the most common event in real wallets
+        decoder = decode_transfer if topic0 == ERC20_TRANSFER_TOPIC else TOPIC0_DECODERS.get(topic0)
         if decoder:
-            print(f"➡️ Decoding with: {decoder.__name__} | topic0: {topic0}")
+            if debug:
+                logger.debug("Decoding with: %s | topic0: %s", decoder.__name__, topic0)
+
+            log_block_hex = log.get("blockNumber") or "0x0"
+            if log_block_hex != block_hex:
+                try:
+                    block_num = int(log_block_hex, 16)
+                except (TypeError, ValueError):
+                    malformed += 1
+                    continue
+                block_hex = log_block_hex
 
-            decoded = decoder(log)
+            decoded = decoder(log, block_num)
             if decoded:
                 decoded_events.append(decoded)
+            else:
+                malformed += 1
         else:
-            print(f"⚠️ Unknown topic0: {topic0}")
+            unknown += 1
+            if debug:
+                logger.debug("Unknown topic0: %s", topic0)
 
+    if unknown:
+        logger.info("Skipped %d logs with unknown topic0", unknown)
+    if malformed:
+        logger.info("Skipped %d known-topic logs the decoder rejected (wrong topic count / short data / bad blockNumber)", malformed)
     return decoded_events
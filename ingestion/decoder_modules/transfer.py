@@ -4,34 +4,35 @@ ERC Transfer Decoder
 Handles decoding of ERC20, ERC721, and ERC1155 Transfer events.
 """
 
+import logging
 from typing import Optional, Dict, Any
 
-def decode_transfer(log: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+logger = logging.getLogger(__name__)
+
+def decode_transfer(log: Dict[str, Any], block_num: Optional[int] = None) -> Optional[Dict[str, Any]]:
     """
     Decodes a Transfer event from log. Returns normalized dict or None.
+    block_num: already-parsed blockNumber (decode_logs passes it once per receipt).
     Expected topic0 (ERC20/721): Transfer(address,address,uint256)
     """
-    try:
-        topics = log.get("topics", [])
-        if len(topics) != 3:
-            return None  # Not a standard Transfer event
-
-        from_address = "0x" + topics[1][-40:]
-        to_address = "0x" + topics[2][-40:]
-        token_address = log.get("address")
-        value_hex = log.get("data", "0x0")
-        value = int(value_hex, 16)
+    topics = log.get("topics") or ()
+    if len(topics) != 3:
+        return None  # Not a standard Transfer event (ERC721 has the tokenId as a 4th topic)
 
-        return {
-            "event": "transfer",
-            "token_address": token_address,
-            "from": from_address,
-            "to": to_address,
-            "amount": value,
-            "tx_hash": log.get("transactionHash"),
-            "block_number": int(log.get("blockNumber", "0x0"), 16)
-        }
-
-    except Exception as e:
-        print(f"❌ Failed to decode Transfer: {e}")
+    value_hex = log.get("data") or "0x0"
+    # int(s, 16) is C-level already and beats bytes.fromhex + int.from_bytes on 32-byte words
+    try:
+        value = int(value_hex, 16) if len(value_hex) > 2 else 0
+    except ValueError:
+        logger.debug("Skipping Transfer with non-hex data: %s", value_hex[:20])
         return None
+
+    return {
+        "event": "transfer",
+        "token_address": log.get("address"),
+        "from": "0x" + topics[1][-40:],
+        "to": "0x" + topics[2][-40:],
+        "amount": value,
+        "tx_hash": log.get("transactionHash"),
+        "block_number": block_num if block_num is not None else int(log.get("blockNumber", "0x0"), 16)
+    }
@@ -4,71 +4,71 @@ Uniswap V3 Swap decoder
 This module decodes Swap events from Uniswap V3 pool contracts using log data.
 """
 
+import logging
 from typing import Dict, Any, Optional
 
+logger = logging.getLogger(__name__)
 
-def decode_uniswap_v3(log: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+
+def decode_uniswap_v3(log: Dict[str, Any], block_num: Optional[int] = None) -> Optional[Dict[str, Any]]:
     """
     Decode a Uniswap V3 Swap event log into a normalized event dictionary.
 
     Args:
         log (dict): Raw log from Alchemy eth_getTransactionReceipt.
+        block_num (int, optional): Already-parsed blockNumber; parsed from the log if omitted.
 
     Returns:
         dict or None: Normalized event if successful, None otherwise.
     """
-    try:
-        topics = log.get("topics", [])
-        if len(topics) != 3:
-            print(f"⛔ Skipping: Unexpected number of topics ({len(topics)})")
-            return None
-
-        sender = "0x" + topics[1][-40:]
-        recipient = "0x" + topics[2][-40:]
+    topics = log.get("topics") or ()
+    if len(topics) != 3:
+        logger.debug("Skipping: Unexpected number of topics (%d)", len(topics))
+        return None
 
-        data = log.get("data", "")
-        if not data or data == "0x":
-            print(f"⛔ Skipping: No data field present in log")
-            return None
+    data = log.get("data") or "0x"
+    if len(data) < 130:  # "0x" + two 32-byte words
+        logger.debug("Skipping: Data too short (%d hex chars)", len(data))
+        return None
 
-        raw_bytes = bytes.fromhex(data[2:])
-        if len(raw_bytes) < 64:
-            print(f"⛔ Skipping: Data too short ({len(raw_bytes)} bytes)")
-            return None
+    try:
+        raw_bytes = bytes.fromhex(data[2:130])
+    except ValueError:
+        logger.debug("Skipping: data is not hex")
+        return None
 
-        # Decode the first 2 values: amount0 and amount1 (both int256)
-        amount0 = int.from_bytes(raw_bytes[0:32], byteorder="big", signed=True)
-        amount1 = int.from_bytes(raw_bytes[32:64], byteorder="big", signed=True)
+    sender = "0x" + topics[1][-40:]
+    recipient = "0x" + topics[2][-40:]
 
-        # Determine swap direction and flow based on signs
-        if amount0 < 0 and amount1 > 0:
-            direction = "token0→token1"
-            amount_in = abs(amount0)
-            amount_out = abs(amount1)
-        elif amount1 < 0 and amount0 > 0:
-            direction = "token1→token0"
-            amount_in = abs(amount1)
-            amount_out = abs(amount0)
-        else:
-            direction = "ambiguous"
-            amount_in = abs(amount0)
-            amount_out = abs(amount1)
-            print(f"⚠️ Ambiguous swap amounts: amount0={amount0}, amount1={amount1}")
+    # Decode the first 2 values: amount0 and amount1 (both int256)
+    amount0 = int.from_bytes(raw_bytes[0:32], byteorder="big", signed=True)
+    amount1 = int.from_bytes(raw_bytes[32:64], byteorder="big", signed=True)
 
-        print(f"🟢 Decoded Uniswap V3 Swap: {amount_in} in → {amount_out} out")
+    # Determine swap direction and flow based on signs
+    if amount0 < 0 and amount1 > 0:
+        direction = "token0→token1"
+        amount_in = abs(amount0)
+        amount_out = abs(amount1)
+    elif amount1 < 0 and amount0 > 0:
+        direction = "token1→token0"
+        amount_in = abs(amount1)
+        amount_out = abs(amount0)
+    else:
+        direction = "ambiguous"
+        amount_in = abs(amount0)
+        amount_out = abs(amount1)
+        logger.debug("Ambiguous swap amounts: amount0=%s, amount1=%s", amount0, amount1)
 
-        return {
-            "event": "uniswap_v3_swap",
-            "direction": direction,
-            "from": sender,
-            "to": recipient,
-            "amount_in": float(amount_in),
-            "amount_out": float(amount_out),
-            "tx_hash": log.get("transactionHash"),
-            "block_number": int(log.get("blockNumber", "0x0"), 16),
-            "contract": log.get("address")
-        }
+    logger.debug("Decoded Uniswap V3 Swap: %s in → %s out", amount_in, amount_out)
 
-    except Exception as e:
-        print(f"❌ Exception during Uniswap V3 decode: {e}")
-        return None
+    return {
+        "event": "uniswap_v3_swap",
+        "direction": direction,
+        "from": sender,
+        "to": recipient,
+        "amount_in": float(amount_in),
+        "amount_out": float(amount_out),
+        "tx_hash": log.get("transactionHash"),
+        "block_number": block_num if block_num is not None else int(log.get("blockNumber", "0x0"), 16),
+        "contract": log.get("address")
+    }
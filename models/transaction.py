@@ -14,7 +14,7 @@ from typing import Optional, Dict, List
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     """
     Represents an ERC20 token or native asset (e.g. ETH).
@@ -43,14 +43,14 @@ class TxType(str, Enum):
     TRANSFER = "transfer"
     UNKNOWN = "unknown"
 
-@dataclass
+@dataclass(slots=True)
 class TokenAmount:
     token_address: str
     token_symbol: str
     amount: float
     usd_value: Optional[float]
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     hash: str
     block_number: int
@@ -67,7 +67,7 @@ class Transaction:
     outputs: List[TokenAmount]
     comment: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class Wallet:
     """
     Placeholder for wallet metadata.
@@ -9,11 +9,18 @@ Usage: Run as standalone script or import into ROI calculation pipeline.
 """
 
 import os
-import requests
-import json
+import sys
+import orjson
 from dotenv import load_dotenv
 from pathlib import Path
 
+# Project root importable for the standalone `python mvp/balances_covalent.py` run
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from mvp.http_cache import SESSION
+
 # Load API key from .env file
 load_dotenv()
 COVALENT_API_KEY = os.getenv("COVALENT_API_KEY")
@@ -36,9 +43,9 @@ def fetch_portfolio():
     }
 
     try:
-        response = requests.get(API_URL, params=params, timeout=15)
+        response = SESSION.get(API_URL, params=params, timeout=15)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
 
         tokens = []
         total_value = 0.0
@@ -75,8 +82,10 @@ def save_to_file(data):
     Saves the given data dictionary as JSON to the OUTPUT_PATH.
     """
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(data, f, indent=2)
+    tmp = OUTPUT_PATH.with_suffix(".json.tmp")
+    with open(tmp, "wb") as f:
+        f.write(orjson.dumps(data))  # compact: smaller and faster than the indented form
+    tmp.replace(OUTPUT_PATH)  # atomic swap, readers never see a half-written file
     print(f"[✅] Portfolio saved to {OUTPUT_PATH}")
 
 if __name__ == "__main__":
@@ -21,10 +21,14 @@ Author: WalletGlass (MVP v2)
 
 import os
 import json
+import time
+import orjson
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, List, Tuple, Optional
 
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from datetime import datetime, timezone  # <-- add
 
@@ -35,6 +39,7 @@ RAW_OUTPUT_PATH = ROOT / "data" / "wallet_portfolio_raw.json"  # <-- add
 # ---- Env & constants ----
 load_dotenv()
 from mvp.secrets import get_secret
+from mvp.http_cache import conditional_get
 
 API_KEY = get_secret("MORALIS_API_KEY")
 ADDRESS = os.getenv("WALLET_ADDRESS", "0x0193138F52c349A66d0b7Ccbe29d70E613E6C968")
@@ -49,7 +54,7 @@ FILE_DENY_PATH = ROOT / "data" / "spam_tokens.json"
 FILE_DENY = set()
 if FILE_DENY_PATH.exists():
     try:
-        FILE_DENY = {a.strip().lower() for a in json.loads(FILE_DENY_PATH.read_text()) if isinstance(a, str)}
+        FILE_DENY = {a.strip().lower() for a in orjson.loads(FILE_DENY_PATH.read_bytes()) if isinstance(a, str)}
     except Exception:
         print("[warn] Could not parse /data/spam_tokens.json; ignoring file denylist")
 DENYLIST = ENV_DENY.union(FILE_DENY)
@@ -62,15 +67,16 @@ def is_spam(token: Dict[str, Any]) -> bool:
 
 # Moralis' pseudo-address for native ETH in some price endpoints
 ETH_PSEUDO = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
+_ETH_PSEUDO_LC = ETH_PSEUDO.lower()
 
 
 # ---- HTTP helper with clear errors ----
 def http_get(url: str, params: Dict[str, Any], timeout: int = 20) -> Dict[str, Any] | List[Dict[str, Any]]:
-    resp = requests.get(url, headers=HEADERS, params=params, timeout=timeout)
+    resp = conditional_get(url, headers=HEADERS, params=params, timeout=timeout)  # ETag revalidation
     if not resp.ok:
         raise RuntimeError(f"[❌] GET {url} failed: {resp.status_code} - {resp.text}")
     try:
-        return resp.json()
+        return orjson.loads(resp.content)
     except Exception as e:
         raise RuntimeError(f"[❌] Non-JSON response from {url}: {e}")
 
@@ -101,6 +107,15 @@ def call_erc20(address: str) -> Tuple[List[Dict[str, Any]], str, Dict[str, Any]
     return items, "{address}/erc20", data
 
 
+ETH_PRICE_TTL_S = 60
+
+
+@lru_cache(maxsize=1)
+def _eth_price(bucket: int) -> Dict[str, Any]:
+    # bucket = time // ETH_PRICE_TTL_S, so a new minute is a cache miss (plain: price reused for ≤60s)
+    return http_get(f"{BASE_URL}/erc20/{ETH_PSEUDO}/price", {"chain": CHAIN})
+
+
 def get_native_eth_if_missing(address: str) -> Optional[Dict[str, Any]]:
     """
     If native ETH wasn't included in token list, fetch balance and price and return a token-like dict.
@@ -110,14 +125,14 @@ def get_native_eth_if_missing(address: str) -> Optional[Dict[str, Any]]:
     Returns None if anything fails (we don't hard-fail just for native top-up).
     """
     try:
-        # balance
+        # balance + price are independent → one round-trip of wall time instead of two
         bal_url = f"{BASE_URL}/{address}/balance"
-        bal = http_get(bal_url, {"chain": CHAIN})
-        balance_eth = int(bal.get("balance", 0)) / 1e18
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            bal_f = ex.submit(http_get, bal_url, {"chain": CHAIN})
+            price_f = ex.submit(_eth_price, int(time.time() // ETH_PRICE_TTL_S))
+            bal, price = bal_f.result(), price_f.result()
 
-        # price
-        price_url = f"{BASE_URL}/erc20/{ETH_PSEUDO}/price"
-        price = http_get(price_url, {"chain": CHAIN})
+        balance_eth = int(bal.get("balance", 0)) / 1e18
         usd_price = price.get("usdPrice") or price.get("usd_price") or 0.0
 
         usd_value = balance_eth * float(usd_price)
@@ -143,23 +158,27 @@ def as_float(x: Any, default: float = 0.0) -> float:
         return default
 
 
+def _first_present(token: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    """First non-None value among keys (Moralis endpoints disagree on snake/camel case)."""
+    for k in keys:
+        v = token.get(k)
+        if v is not None:
+            return v
+    return None
+
+
+# 10**decimals for every decimals an ERC-20 can sensibly declare (uint256 tops out at 77 digits)
+_POW10 = tuple(10.0 ** i for i in range(78))
+
+
 def normalize_item(token: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     if is_spam(token):
         return None
 
-    usd_value = token.get("usd_value")
-    if usd_value is None:
-        usd_value = token.get("usdValue")
-    if usd_value is None:
-        usd_value = token.get("quote")
-    usd_value = as_float(usd_value, 0.0)
+    usd_value = as_float(_first_present(token, ("usd_value", "usdValue", "quote")), 0.0)
     if usd_value < 0.01:
         return None
 
-    name = token.get("name") or "Unknown"
-    symbol = token.get("symbol") or "UNK"
-    contract = (token.get("token_address") or "").lower()
-
     # balance
     if token.get("balance_formatted") not in (None, ""):
         balance = as_float(token["balance_formatted"], 0.0)
@@ -169,22 +188,19 @@ def normalize_item(token: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         try:
             raw_f = float(raw) if raw is not None else 0.0
             dec_i = int(dec) if dec is not None and str(dec).strip() != "" else 0
-            balance = raw_f / (10 ** dec_i) if dec_i > 0 else raw_f
+            balance = raw_f / (_POW10[dec_i] if dec_i < len(_POW10) else 10.0 ** dec_i) if dec_i > 0 else raw_f
         except Exception:
             balance = 0.0
 
     # price
-    usd_price = token.get("usd_price")
-    if usd_price is None:
-        usd_price = token.get("usdPrice")
-    usd_price = as_float(usd_price, 0.0)
+    usd_price = as_float(_first_present(token, ("usd_price", "usdPrice")), 0.0)
     if usd_price == 0 and balance > 0:
         usd_price = usd_value / balance
 
     return {
-        "contract_name": name,
-        "contract_ticker_symbol": symbol,
-        "contract_address": contract,
+        "contract_name": token.get("name") or "Unknown",
+        "contract_ticker_symbol": token.get("symbol") or "UNK",
+        "contract_address": (token.get("token_address") or "").lower(),
         "balance": round(balance, 6),
         "usd_price": round(usd_price, 6),
         "quote": round(usd_value, 2),
@@ -193,26 +209,23 @@ def normalize_item(token: Dict[str, Any]) -> Optional[Dict[str, Any]]:
 
 def tokens_include_native(items: List[Dict[str, Any]]) -> bool:
     # native may be indicated by a flag or the pseudo address
-    for t in items:
-        if t.get("native_token") is True:
-            return True
-        addr = (t.get("token_address") or "").lower()
-        if addr == ETH_PSEUDO.lower():
-            return True
-        # Some variants return ETH with empty decimals and ETH symbol; that's fine too.
-    return False
+    # (Some variants return ETH with empty decimals and ETH symbol; that's fine too.)
+    return any(
+        t.get("native_token") is True or (t.get("token_address") or "").lower() == _ETH_PSEUDO_LC
+        for t in items
+    )
 
 
 # ---- Build portfolio ----
 def fetch_all_tokens(address: str) -> Tuple[List[Dict[str, Any]], str, Dict[str, Any] | List[Dict[str, Any]]]:
+    # Legacy /erc20 only as a fallback: it costs a second Moralis call (and quota) per load
     try:
         items, src, raw = call_wallets_tokens(address)
         if items:
             return items, src, raw
     except Exception as e:
         print(f"[info] wallets/tokens endpoint failed or empty: {e}")
-    items, src, raw = call_erc20(address)
-    return items, src, raw
+    return call_erc20(address)
 
 
 
@@ -224,29 +237,24 @@ def build_portfolio(address: str) -> Dict[str, Any]:
         preview = items[:2] if isinstance(items, list) else items
         print("[debug] endpoint used:", endpoint_used)
         print("[debug] first items:", json.dumps(preview, indent=2, default=str))
-    # save raw payload
+    # save raw payload (debug artifact: compact orjson bytes, tmp + rename so readers never see half a file)
     RAW_OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(RAW_OUTPUT_PATH, "w") as f:
-        json.dump(raw_payload, f, indent=2)
+    raw_tmp = RAW_OUTPUT_PATH.with_suffix(".json.tmp")
+    raw_tmp.write_bytes(orjson.dumps(raw_payload))
+    raw_tmp.replace(RAW_OUTPUT_PATH)
     # Top up native ETH if missing
     if not tokens_include_native(items):
         native = get_native_eth_if_missing(address)
         if native:
             items.append(native)
 
-    tokens: List[Dict[str, Any]] = []
-    total = 0.0
-    for tok in items:
-        norm = normalize_item(tok)
-        if norm:
-            tokens.append(norm)
-            total += norm["quote"]
-
-    tokens.sort(key=lambda x: x["quote"], reverse=True)
+    tokens: List[Dict[str, Any]] = [norm for norm in map(normalize_item, items) if norm]
+    tokens.sort(key=itemgetter("quote"), reverse=True)
 
     denom = sum(t["quote"] for t in tokens) or 1.0
+    pct_scale = 100 / denom
     for t in tokens:
-        t["portfolio_pct"] = round((t["quote"] / denom) * 100, 4)
+        t["portfolio_pct"] = round(t["quote"] * pct_scale, 4)
 
     snapshot_ts = datetime.now(timezone.utc).isoformat()
 
@@ -262,8 +270,9 @@ def build_portfolio(address: str) -> Dict[str, Any]:
 def save_to_file(data: Dict[str, Any]) -> None:
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     tmp = OUTPUT_PATH.with_suffix(".json.tmp")
-    with open(tmp, "w") as f:
-        json.dump(data, f, indent=2)
+    # Compact bytes straight from orjson; pretty-print only when debugging
+    with open(tmp, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if DEBUG else 0))
     tmp.replace(OUTPUT_PATH)
     print(f"[✅] Portfolio saved to {OUTPUT_PATH}")
 def get_portfolio(address: str) -> Dict[str, Any]:
@@ -0,0 +1,155 @@
+"""
+contract_cache.py — Etherscan is_contract lookups: rate-limited, parallel, remembered for a day.
+
+The same CEXes, bridges and friends show up on every funding/defunding run, and
+whether an address has verified contract code practically never changes, so each
+answer is kept in memory and on disk for TTL_S seconds.
+Failed lookups (network error, rate-limit reply) are never stored.
+
+All callers share one limiter (plain: funding and defunding run side by side in the
+UI, but together they still stay under Etherscan's free-tier ~5 calls/s).
+
+Store: data/contract_cache.sqlite  (address → is_contract, checked_at)
+Used by: funding_v1.py, defunding.py
+"""
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from pathlib import Path
+from typing import Callable, Container, Dict, Iterable, Optional, Tuple
+
+import orjson
+
+from mvp.http_cache import SESSION
+from mvp.secrets import get_secret
+
+CACHE_PATH = Path(__file__).resolve().parent.parent / "data" / "contract_cache.sqlite"
+TTL_S = 24 * 3600
+
+ETHERSCAN_URL = "https://api.etherscan.io/api"
+ETHERSCAN_API_KEY = get_secret("ETHERSCAN_API_KEY")
+ETHERSCAN_CALLS_PER_S = 4    # free tier allows 5; keep a little headroom
+ETHERSCAN_RETRIES = 3        # attempts when Etherscan answers "Max rate limit reached"
+IS_CONTRACT_WORKERS = 5
+
+_lock = threading.Lock()  # resolve_contracts looks addresses up from a thread pool
+_memo: Dict[str, Tuple[bool, float]] = {}
+
+_rate_lock = threading.Lock()
+_next_call_at = 0.0
+
+
+def _wait_for_slot() -> None:
+    """Space Etherscan calls 1/ETHERSCAN_CALLS_PER_S apart across every thread in the process."""
+    global _next_call_at
+    with _rate_lock:
+        now = time.monotonic()
+        slot = max(now, _next_call_at)
+        _next_call_at = slot + 1.0 / ETHERSCAN_CALLS_PER_S
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def _connect() -> sqlite3.Connection:
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS contracts (address TEXT PRIMARY KEY, is_contract INTEGER, checked_at REAL)"
+    )
+    return conn
+
+
+def _lookup(address: str, now: float) -> Optional[bool]:
+    hit = _memo.get(address)
+    if hit is None:
+        try:
+            with _lock, closing(_connect()) as conn:
+                row = conn.execute(
+                    "SELECT is_contract, checked_at FROM contracts WHERE address = ?", (address,)
+                ).fetchone()
+        except Exception as e:
+            print(f"[warn] contract cache read failed: {e}")
+            row = None
+        if row is None:
+            return None
+        hit = _memo[address] = (bool(row[0]), row[1])
+    is_contract, checked_at = hit
+    return is_contract if now - checked_at < TTL_S else None
+
+
+def cached_is_contract(address: str, fetch: Callable[[str], Optional[bool]]) -> bool:
+    """
+    fetch(address) → True/False, or None when the upstream answer can't be trusted.
+    Fresh cached answers skip the call; None is reported as False and not stored.
+    """
+    address = address.lower()
+    now = time.time()
+    cached = _lookup(address, now)
+    if cached is not None:
+        return cached
+
+    result = fetch(address)
+    if result is None:
+        return False
+
+    _memo[address] = (result, now)
+    try:
+        with _lock, closing(_connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO contracts (address, is_contract, checked_at) VALUES (?, ?, ?)",
+                (address, int(result), now),
+            )
+    except Exception as e:
+        print(f"[warn] contract cache write failed: {e}")
+    return result
+
+
+def _etherscan_is_contract(address: str) -> Optional[bool]:
+    """
+    Check if address is a smart contract using Etherscan.
+    None = no trustworthy answer (HTTP error, rate-limit reply) so it isn't cached.
+    """
+    params = {
+        "module": "contract",
+        "action": "getsourcecode",
+        "address": address,
+        "apikey": ETHERSCAN_API_KEY
+    }
+    for _ in range(ETHERSCAN_RETRIES):
+        _wait_for_slot()
+        try:
+            res = SESSION.get(ETHERSCAN_URL, params=params, timeout=5)  # pooled keep-alive
+            if res.status_code != 200:
+                return None
+            data = orjson.loads(res.content)
+        except Exception as e:
+            print(f"⚠️ Etherscan error for {address}: {e}")
+            return None
+        result = data.get("result")
+        if isinstance(result, list) and result:
+            abi = result[0].get("ABI", "")
+            return abi not in ["", "Contract source code not verified"]
+        if "rate limit" not in str(result).lower():
+            return None
+        # "Max rate limit reached" comes back as a string result → take the next slot and retry
+    return None
+
+
+def is_contract(address: str) -> bool:
+    """Etherscan contract check, answered from the cache when seen in the last 24h."""
+    return cached_is_contract(address, _etherscan_is_contract)
+
+
+def resolve_contracts(addresses: Iterable[str], known: Container[str] = ()) -> Dict[str, bool]:
+    """
+    is_contract for each unique address not in `known`, looked up in parallel
+    (plain: the Etherscan round-trips overlap; the shared limiter still paces them).
+    """
+    todo = [a for a in {a.lower() for a in addresses} if a and a not in known]
+    if not todo:
+        return {}
+    with ThreadPoolExecutor(max_workers=IS_CONTRACT_WORKERS) as ex:
+        return dict(zip(todo, ex.map(is_contract, todo)))
@@ -10,109 +10,88 @@ assigns USD value (with fallback), and saves two files:
 """
 
 import os
-import json
-import requests
+import orjson
 from pathlib import Path
 from dotenv import load_dotenv
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 # Load API keys
 load_dotenv()
 from mvp.secrets import get_secret
+from mvp.pnl import sum_accepted_usd
+from mvp.moralis_history import fetch_history
+from mvp.contract_cache import is_contract, resolve_contracts
 MORALIS_API_KEY  = get_secret("MORALIS_API_KEY")
-ETHERSCAN_API_KEY = get_secret("ETHERSCAN_API_KEY")
 HEADERS = {"X-API-Key": MORALIS_API_KEY}
 BASE_URL = "https://deep-index.moralis.io/api/v2.2"
 WALLET = "0x0193138F52c349A66d0b7Ccbe29d70E613E6C968".lower()
 
-# Load fallback ETH price DB
-with open("data/eth_price_db.json") as f:
-    ETH_PRICE_DB = json.load(f)
-
-# Load known withdrawal sinks
-with open("data/known_withdrawal_sinks.json") as f:
-    KNOWN_SINKS = json.load(f)
+# Fallback ETH price DB + known withdrawal sinks (parsed once, shared with funding)
+from mvp.reference_data import ETH_PRICE_DB, KNOWN_SINKS
 
 
 def _sum_defunded_usd(events: list) -> float:
-    return round(sum(e.get("usd", 0.0) for e in events if e.get("status") == "accepted"), 2)
+    return round(sum_accepted_usd(events), 2)
 
 
 def fetch_transactions(wallet: str) -> list:
-    all_txs = []
-    cursor = ""
-    while True:
-        url = f"{BASE_URL}/wallets/{wallet}/history"
-        params = {"cursor": cursor, "exclude_spam": "true", "limit": 100}
-        res = requests.get(url, headers=HEADERS, params=params)
-        if res.status_code != 200:
-            raise Exception(f"❌ Moralis fetch failed: {res.text}")
-        data = res.json()
-        all_txs += data.get("result", [])
-        cursor = data.get("cursor")
-        if not cursor or len(all_txs) >= 1000:
-            break
+    all_txs = fetch_history(wallet, HEADERS)  # shared with the other history reader (see moralis_history)
     print(f"✅ Total transactions fetched: {len(all_txs)}")
     return all_txs
 
 
-def is_contract(address: str) -> bool:
-    url = "https://api.etherscan.io/api"
-    params = {
-        "module": "contract",
-        "action": "getsourcecode",
-        "address": address,
-        "apikey": ETHERSCAN_API_KEY
-    }
-    try:
-        res = requests.get(url, params=params, timeout=5)
-        if res.status_code != 200:
-            return False
-        data = res.json()
-        result = data.get("result")
-        if not isinstance(result, list) or len(result) == 0:
-            return False
-        abi = result[0].get("ABI", "")
-        return abi not in ["", "Contract source code not verified"]
-    except Exception as e:
-        print(f"⚠️ Etherscan error for {address}: {e}")
-        return False
-
-
 def get_eth_usd_price(date: str) -> float | None:
     return ETH_PRICE_DB.get(date)
 
 
-def label_defunding_sink(receiver: str) -> tuple[str, str]:
+def label_defunding_sink(receiver: str, contract_map: Optional[Dict[str, bool]] = None) -> tuple[str, str]:
     receiver = receiver.lower()
     if receiver in KNOWN_SINKS:
         return "accepted", "known_sink"
-    elif is_contract(receiver):
+    elif contract_map[receiver] if contract_map and receiver in contract_map else is_contract(receiver):
         return "rejected", "to_contract_not_in_registry"
     else:
         return "eoa", "to_eoa_not_in_registry"
 
 
-def parse_eth(tx: dict, target_wallet: str) -> list:
+def label_events(events: List[dict]) -> List[dict]:
+    """
+    Fill status/reason on events parsed with label=False. Only counterparties of events
+    that survived the parse filters are checked, each once, in parallel.
+    """
+    contract_map = resolve_contracts((e["to"] for e in events), KNOWN_SINKS)
+    for e in events:
+        e["status"], e["reason"] = label_defunding_sink(e["to"], contract_map)
+    return events
+
+
+def parse_eth(tx: dict, target_wallet: str, label: bool = True) -> list:
+    transfers = tx.get("native_transfers")
+    if not transfers:
+        return []
+
     results = []
-    for t in tx.get("native_transfers", []):
+    for t in transfers:
         from_addr = t.get("from_address", "").lower()
-        to_addr = t.get("to_address", "").lower()
-        if from_addr != target_wallet or to_addr == target_wallet:
+        if from_addr != target_wallet:
             continue  # not outbound
+        to_addr = t.get("to_address", "").lower()
+        if to_addr == target_wallet:
+            continue
 
         amount = float(t.get("value_formatted", 0))
         if amount < 0.01:
             continue
 
+        # tx fields only for kept rows: a tx whose transfers are all rejected never reads them
         date = tx["block_timestamp"][:10]
         usd_price = get_eth_usd_price(date)
         if usd_price is None:
             continue
 
         usd = round(usd_price * amount, 2)
-        status, reason = label_defunding_sink(to_addr)
+        status, reason = label_defunding_sink(to_addr) if label else (None, None)
 
         results.append({
             "hash": tx["hash"],
@@ -128,12 +107,18 @@ def parse_eth(tx: dict, target_wallet: str) -> list:
     return results
 
 
-def parse_erc20(tx: dict, target_wallet: str) -> list:
+def parse_erc20(tx: dict, target_wallet: str, label: bool = True) -> list:
+    transfers = tx.get("erc20_transfers")
+    if not transfers:
+        return []
+
     results = []
-    for t in tx.get("erc20_transfers", []):
+    for t in transfers:
         from_addr = t.get("from_address", "").lower()
+        if from_addr != target_wallet:
+            continue
         to_addr = t.get("to_address", "").lower()
-        if from_addr != target_wallet or to_addr == target_wallet:
+        if to_addr == target_wallet:
             continue
 
         symbol = t.get("token_symbol", "UNKNOWN")
@@ -151,7 +136,7 @@ def parse_erc20(tx: dict, target_wallet: str) -> list:
         except:
             continue
 
-        status, reason = label_defunding_sink(to_addr)
+        status, reason = label_defunding_sink(to_addr) if label else (None, None)
 
         results.append({
             "hash": tx["hash"],
@@ -173,8 +158,9 @@ def get_defunding(address: str) -> Dict[str, Any]:
 
     all_events: List[dict] = []
     for tx in txs:
-        all_events += parse_eth(tx, target)
-        all_events += parse_erc20(tx, target)
+        all_events += parse_eth(tx, target, label=False)
+        all_events += parse_erc20(tx, target, label=False)
+    label_events(all_events)
 
     defunded_usd = _sum_defunded_usd(all_events)
 
@@ -190,17 +176,18 @@ def build_wallet_defunding():
 
     all_events = []
     for tx in txs:
-        all_events += parse_eth(tx, WALLET)
-        all_events += parse_erc20(tx, WALLET)
+        all_events += parse_eth(tx, WALLET, label=False)
+        all_events += parse_erc20(tx, WALLET, label=False)
+    label_events(all_events)
 
     Path("data").mkdir(exist_ok=True)
 
-    with open("data/wallet_defunding_full.json", "w") as f:
-        json.dump(all_events, f, indent=2)
+    with open("data/wallet_defunding_full.json", "wb") as f:
+        f.write(orjson.dumps(all_events, option=orjson.OPT_INDENT_2, default=str))
 
     filtered = [e for e in all_events if e["status"] == "accepted"]
-    with open("data/wallet_defunding.json", "w") as f:
-        json.dump(filtered, f, indent=2)
+    with open("data/wallet_defunding.json", "wb") as f:
+        f.write(orjson.dumps(filtered, option=orjson.OPT_INDENT_2, default=str))
 
     print(f"✅ Saved {len(filtered)} accepted defunding events to wallet_defunding.json")
     print(f"🧾 Total outbound events logged: {len(all_events)}")
@@ -8,12 +8,19 @@ sanity-checked data to data/wallet_funding.json
 """
 
 import os
-import json
-import requests
+import sys
+import orjson
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
 
+# Project root importable for the standalone `python mvp/funding.py` run
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from mvp.http_cache import SESSION
+
 # Load Moralis API key from .env
 load_dotenv()
 MORALIS_API_KEY = os.getenv("MORALIS_API_KEY")
@@ -23,9 +30,8 @@ HEADERS = {"x-api-key": MORALIS_API_KEY}
 # Target wallet
 WALLET = "0x0193138F52c349A66d0b7Ccbe29d70E613E6C968".lower()
 
-# Load fallback ETH price DB
-with open("data/eth_price_db.json") as f:
-    ETH_PRICE_DB = json.load(f)
+# Fallback ETH price DB (parsed once, shared with funding_v1/defunding)
+from mvp.reference_data import ETH_PRICE_DB
 
 
 def fetch_all_transactions(wallet: str) -> list:
@@ -37,10 +43,10 @@ def fetch_all_transactions(wallet: str) -> list:
     while True:
         url = f"{BASE_URL}/wallets/{wallet}/history"
         params = {"cursor": cursor, "exclude_spam": "true", "limit": 100}
-        res = requests.get(url, headers=HEADERS, params=params)
+        res = SESSION.get(url, headers=HEADERS, params=params, timeout=15)
         if res.status_code != 200:
             raise Exception(f"❌ Moralis fetch failed: {res.text}")
-        data = res.json()
+        data = orjson.loads(res.content)
         all_txs += data.get("result", [])
         cursor = data.get("cursor")
         if not cursor or len(all_txs) >= 1000:
@@ -60,20 +66,25 @@ def parse_eth_funding(tx: dict) -> list:
     """
     Extract inbound ETH transfers with USD value
     """
+    transfers = tx.get("native_transfers")
+    if not transfers:
+        return []
+
     funding = []
-    for t in tx.get("native_transfers", []):
-        from_addr = t.get("from_address", "").lower()
+    for t in transfers:
         to_addr = t.get("to_address", "").lower()
-        if to_addr != WALLET or from_addr == WALLET:
+        if to_addr != WALLET:
             continue  # not inbound
+        from_addr = t.get("from_address", "").lower()
+        if from_addr == WALLET:
+            continue
 
         amount = float(t.get("value_formatted", 0))
         if amount < 0.01:
             continue  # ignore dust
 
         block = int(tx.get("block_number"))
-        timestamp = tx.get("block_timestamp", "")
-        date = timestamp[:10]  # YYYY-MM-DD
+        date = tx.get("block_timestamp", "")[:10]  # YYYY-MM-DD
 
         price = get_eth_usd_price_fallback(date)
         if not price:
@@ -97,11 +108,17 @@ def parse_erc20_funding(tx: dict) -> list:
     """
     Extract inbound ERC-20 transfers with sanity-checked USD values
     """
+    transfers = tx.get("erc20_transfers")
+    if not transfers:
+        return []
+
     funding = []
-    for t in tx.get("erc20_transfers", []):
-        from_addr = t.get("from_address", "").lower()
+    for t in transfers:
         to_addr = t.get("to_address", "").lower()
-        if to_addr != WALLET or from_addr == WALLET:
+        if to_addr != WALLET:
+            continue
+        from_addr = t.get("from_address", "").lower()
+        if from_addr == WALLET:
             continue
 
         symbol = t.get("token_symbol", "UNKNOWN")
@@ -144,8 +161,8 @@ def build_wallet_funding():
     funding_events = sorted(funding_events, key=lambda x: x["block"])
 
     Path("data").mkdir(exist_ok=True)
-    with open("data/wallet_funding.json", "w") as f:
-        json.dump(funding_events, f, indent=2)
+    with open("data/wallet_funding.json", "wb") as f:
+        f.write(orjson.dumps(funding_events, option=orjson.OPT_INDENT_2, default=str))
 
     print(f"✅ {len(funding_events)} funding events saved to data/wallet_funding.json")
 
@@ -0,0 +1,111 @@
+"""
+http_cache.py — Conditional GETs (ETag / Last-Modified) backed by a small on-disk store.
+
+TTL caches refetch everything once they expire; here the previous validator is sent
+back (If-None-Match / If-Modified-Since) and a 304 Not Modified reply is answered
+from the stored body, so unchanged data costs one tiny round-trip.
+
+Store: data/http_cache.sqlite  (url+params → etag, last_modified, body)
+Used by: moralis_history.py, balances_moralis.py (SESSION also: funding_v1.py, defunding.py, funding.py, price_cache.py, balances_covalent.py)
+
+SESSION is the shared pooled requests.Session for upstream APIs
+(jargon: keep-alive connection pool) (plain: no new TCP+TLS handshake per request).
+"""
+
+import sqlite3
+import threading
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+CACHE_PATH = Path(__file__).resolve().parent.parent / "data" / "http_cache.sqlite"
+MAX_ROWS = 2000  # oldest-written rows beyond this are evicted (plain: the file can't grow forever)
+
+_lock = threading.Lock()  # the UI fetches funding/defunding/portfolio from parallel threads
+
+SESSION = requests.Session()
+SESSION.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip"})
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 502, 503, 504)),
+))
+
+
+def _connect() -> sqlite3.Connection:
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS http_cache ("
+        "key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB)"
+    )
+    return conn
+
+
+def _cache_key(url: str, params: Optional[Dict[str, Any]]) -> str:
+    return f"{url}?{urlencode(sorted((params or {}).items()))}"
+
+
+def conditional_get(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: Optional[float] = None,
+) -> requests.Response:
+    """
+    Drop-in for requests.get(...): same Response object back.
+    On 304 the stored body is swapped in and status_code is reported as 200.
+    Any cache problem falls back to a plain GET.
+    Requests carrying a non-empty "cursor" param bypass the store entirely.
+    """
+    if (params or {}).get("cursor"):
+        # Cursor pages are effectively one-time URLs: storing them only grows the file
+        return SESSION.get(url, headers=headers, params=params, timeout=timeout)
+
+    key = _cache_key(url, params)
+    req_headers = dict(headers or {})
+    row = None
+    try:
+        with _lock, closing(_connect()) as conn:
+            row = conn.execute(
+                "SELECT etag, last_modified, body FROM http_cache WHERE key = ?", (key,)
+            ).fetchone()
+    except Exception as e:
+        print(f"[warn] http cache read failed: {e}")
+
+    if row:
+        etag, last_modified, _ = row
+        if etag:
+            req_headers["If-None-Match"] = etag
+        if last_modified:
+            req_headers["If-Modified-Since"] = last_modified
+
+    res = SESSION.get(url, headers=req_headers, params=params, timeout=timeout)
+
+    if res.status_code == 304 and row:
+        res._content = row[2]
+        res.status_code = 200
+        return res
+
+    etag = res.headers.get("ETag")
+    last_modified = res.headers.get("Last-Modified")
+    if res.status_code == 200 and (etag or last_modified):
+        try:
+            with _lock, closing(_connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO http_cache (key, etag, last_modified, body) VALUES (?, ?, ?, ?)",
+                    (key, etag, last_modified, res.content),
+                )
+                # REPLACE gives the row a fresh rowid, so low rowids are the least recently written
+                conn.execute(
+                    "DELETE FROM http_cache WHERE rowid <= (SELECT MAX(rowid) FROM http_cache) - ?",
+                    (MAX_ROWS,),
+                )
+        except Exception as e:
+            print(f"[warn] http cache write failed: {e}")
+    return res
@@ -0,0 +1,67 @@
+"""
+moralis_history.py — One walk of Moralis /wallets/{address}/history shared by funding and defunding.
+
+Cursor pages can't be requested in parallel (plain: each page's cursor only arrives
+with the previous page), so the latency win is not walking the same pages twice.
+funding_v1 and defunding ask for identical pages, usually at the same moment from
+the UI's fetch threads: the first caller walks, a concurrent caller waits for that
+result, and the list is reused for HISTORY_REUSE_S seconds.
+
+Used by: funding_v1.py, defunding.py
+"""
+
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import orjson
+
+from mvp.http_cache import conditional_get
+
+BASE_URL = "https://deep-index.moralis.io/api/v2.2"
+PAGE_LIMIT = 100
+MAX_TXS = 1000
+HISTORY_REUSE_S = 60
+
+_guard = threading.Lock()
+_wallet_locks: Dict[str, threading.Lock] = {}
+_recent: Dict[str, Tuple[float, List[dict]]] = {}  # wallet → (fetched_at, txs)
+
+
+def _walk(wallet: str, headers: Dict[str, str]) -> List[dict]:
+    all_txs: List[dict] = []
+    cursor = ""
+    url = f"{BASE_URL}/wallets/{wallet}/history"
+    while True:
+        params = {"cursor": cursor, "exclude_spam": "true", "limit": PAGE_LIMIT}
+        res = conditional_get(url, headers=headers, params=params)  # 304 → stored page
+        if res.status_code != 200:
+            raise Exception(f"❌ Moralis fetch failed: {res.text}")
+        data = orjson.loads(res.content)
+        all_txs += data.get("result", [])
+        cursor = data.get("cursor")
+        if not cursor or len(all_txs) >= MAX_TXS:
+            return all_txs
+
+
+def fetch_history(wallet: str, headers: Dict[str, str]) -> List[dict]:
+    """
+    Wallet history (ETH + ERC20), newest first, capped at MAX_TXS.
+    Treat the returned list as read-only: callers may share it.
+    """
+    wallet = wallet.lower()
+    with _guard:
+        lock = _wallet_locks.setdefault(wallet, threading.Lock())
+
+    with lock:  # (jargon: single-flight) (plain: a second caller waits instead of refetching)
+        hit = _recent.get(wallet)
+        if hit and time.monotonic() - hit[0] < HISTORY_REUSE_S:
+            return hit[1]
+
+        txs = _walk(wallet, headers)
+        now = time.monotonic()
+        with _guard:
+            for w in [w for w, (ts, _) in _recent.items() if now - ts >= HISTORY_REUSE_S]:
+                del _recent[w]
+            _recent[wallet] = (now, txs)
+        return txs
@@ -49,6 +49,20 @@ def save_json(data: Dict[str, Any], path: Path) -> None:
         json.dump(data, f, indent=2)
 
 
+# ---------- Event aggregation ----------
+
+def sum_accepted_usd(events: list) -> float:
+    """
+    Single pass over events: total "usd" of the ones with status == "accepted".
+    Shared by the funding/defunding fetchers and the file adapters below.
+    """
+    total = 0.0
+    for e in events:
+        if e.get("status") == "accepted":
+            total += e.get("usd", 0.0)
+    return total
+
+
 # ---------- Format adapters (robust to shapes) ----------
 
 def _extract_total_funded_usd(obj: Any) -> float:
@@ -58,7 +72,7 @@ def _extract_total_funded_usd(obj: Any) -> float:
       - dict with {"total_funded_usd": float} or {"funded_usd": float}
     """
     if isinstance(obj, list):
-        return float(sum(e.get("usd", 0.0) for e in obj if e.get("status") == "accepted"))
+        return float(sum_accepted_usd(obj))
     if isinstance(obj, dict):
         return float(obj.get("total_funded_usd") or obj.get("funded_usd") or 0.0)
     raise ValueError("Unexpected funding JSON shape (must be list or dict).")
@@ -71,7 +85,7 @@ def _extract_total_defunded_usd(obj: Any) -> float:
       - dict with {"total_defunded_usd": float} or {"defunded_usd": float}
     """
     if isinstance(obj, list):
-        return float(sum(e.get("usd", 0.0) for e in obj if e.get("status") == "accepted"))
+        return float(sum_accepted_usd(obj))
     if isinstance(obj, dict):
         return float(obj.get("total_defunded_usd") or obj.get("defunded_usd") or 0.0)
     raise ValueError("Unexpected defunding JSON shape (must be list or dict).")
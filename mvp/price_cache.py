@@ -8,10 +8,11 @@ Used by: funding.py to value funding transfers in USD at time of receipt.
 """
 
 import os
-import requests
 from datetime import datetime
 from typing import Optional
 
+from mvp.http_cache import SESSION
+
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -42,7 +43,7 @@ def get_usd_price(token: str, timestamp: int) -> Optional[float]:
     }
 
     try:
-        res = requests.post(BASE_URL, headers=headers, json=payload)
+        res = SESSION.post(BASE_URL, headers=headers, json=payload, timeout=15)
         res.raise_for_status()
         data = res.json()
         price = data.get("prices", [{}])[0].get("price")
@@ -0,0 +1,116 @@
+"""
+redis_cache.py — Shared (cross-worker) cache for the UI fetchers.
+
+st.cache_data lives inside one Streamlit process; this layer sits underneath it
+so every worker/restart can reuse the same Moralis/Etherscan results.
+
+- Keyed by dataset + address: wg:<kind>:<address>
+- Dynamic TTL: clamp(policy_min, elapsed * K + buffer, policy_max)
+  (plain: slow upstream calls are kept longer, cheap ones refresh sooner)
+- Stale fallback: a long-lived copy is returned (flagged "stale") if the upstream call fails;
+  callers that memoize (the app's st caches) raise StaleResult so it isn't pinned
+
+Env / secrets:
+  REDIS_URL=redis://...   # optional; without it (or without the redis package) calls pass straight through
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+import orjson
+
+from mvp.secrets import get_secret
+
+log = logging.getLogger(__name__)
+
+# kind → (min_ttl_s, max_ttl_s); funding history rarely changes, balances move.
+# The app's per-process st caches sit in front of this: app.py takes BALANCES_TTL from the
+# portfolio max so the short balance TTL is actually observable.
+TTL_POLICY = {
+    "funding": (1800, 3600),
+    "defunding": (1800, 3600),
+    "portfolio": (10, 30),
+}
+TTL_ELAPSED_K = 60          # seconds of TTL per second the upstream call took
+STALE_TTL = 7 * 24 * 3600   # how long the fallback copy survives
+
+
+class StaleResult(Exception):
+    """
+    Raised by callers that must not memoize a stale fallback (e.g. behind st.cache_*);
+    .data is the {"stale": True} copy cached_fetch returned.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        super().__init__("upstream failing; serving last known copy")
+        self.data = data
+
+
+_client = None
+_client_ready = False
+
+
+def _redis():
+    """Lazily connect once per process; None if Redis isn't configured/available."""
+    global _client, _client_ready
+    if _client_ready:
+        return _client
+    _client_ready = True
+    url = get_secret("REDIS_URL", "")
+    if not url:
+        return None
+    try:
+        import redis
+        _client = redis.Redis.from_url(url, socket_timeout=1)
+        _client.ping()
+    except Exception as e:
+        log.warning("Redis unavailable, using direct fetches: %s", e)
+        _client = None
+    return _client
+
+
+def dynamic_ttl(kind: str, elapsed: float) -> int:
+    lo, hi = TTL_POLICY[kind]
+    return int(min(hi, max(lo, elapsed * TTL_ELAPSED_K + lo)))
+
+
+def cached_fetch(kind: str, address: str, fetch: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Return fetch(address), served from Redis when possible.
+    On upstream failure returns the last stored copy with {"stale": True}; re-raises if there is none.
+    """
+    r = _redis()
+    if r is None:
+        return fetch(address)
+
+    key = f"wg:{kind}:{address.lower()}"
+    stale_key = f"{key}:stale"
+    try:
+        hit: Optional[bytes] = r.get(key)
+        if hit is not None:
+            return orjson.loads(hit)
+    except Exception as e:
+        log.warning("Redis GET failed for %s: %s", key, e)
+
+    t0 = time.perf_counter()
+    try:
+        data = fetch(address)
+    except Exception:
+        try:
+            old = r.get(stale_key)
+        except Exception:
+            old = None
+        if old is None:
+            raise
+        data = orjson.loads(old)
+        data["stale"] = True
+        return data
+
+    try:
+        payload = orjson.dumps(data)
+        r.setex(key, dynamic_ttl(kind, time.perf_counter() - t0), payload)
+        r.setex(stale_key, STALE_TTL, payload)
+    except Exception as e:
+        log.warning("Redis SET failed for %s: %s", key, e)
+    return data
@@ -0,0 +1,32 @@
+"""
+reference_data.py — Static lookup files, parsed once per process.
+
+funding.py, funding_v1.py and defunding.py used to each json.load the same
+files at import; importing from here means one orjson parse no matter how many
+of them the app loads.
+
+- ETH_PRICE_DB:  {"YYYY-MM-DD": usd} daily ETH close (built by scripts/build_eth_price_db.py)
+- KNOWN_SOURCES: frozenset of lowercase addresses from known_funding_sources.json
+- KNOWN_SINKS:   frozenset of lowercase addresses from known_withdrawal_sinks.json
+"""
+
+from pathlib import Path
+from typing import Dict, FrozenSet
+
+import orjson
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+def _load(name: str):
+    return orjson.loads((DATA_DIR / name).read_bytes())
+
+
+def _address_set(name: str) -> FrozenSet[str]:
+    # only membership is used; the label/type metadata stays in the file
+    return frozenset(addr.lower() for addr in _load(name))
+
+
+ETH_PRICE_DB: Dict[str, float] = _load("eth_price_db.json")
+KNOWN_SOURCES: FrozenSet[str] = _address_set("known_funding_sources.json")
+KNOWN_SINKS: FrozenSet[str] = _address_set("known_withdrawal_sinks.json")
@@ -0,0 +1,12 @@
+# tests/conftest.py
+# Make the project root (mvp, ingestion, app) and archive/ (walletglass_core) importable,
+# the same way scripts/ and app/app.py put the root on sys.path.
+
+import os
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+for path in (ROOT_DIR, os.path.join(ROOT_DIR, "archive")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,168 @@
+# tests/test_contract_cache.py
+# cached_is_contract: answers kept for TTL_S (memory + disk), untrustworthy answers never stored;
+# the Etherscan call retries rate-limit replies and reports HTTP failures as "no answer".
+
+import os
+
+import orjson
+import pytest
+import requests
+
+os.environ.setdefault("ETHERSCAN_API_KEY", "test-key")  # read at import
+
+from mvp import contract_cache
+
+ADDR = "0x28C6c06298d514Db089934071355E5743bf21d60"
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(contract_cache, "CACHE_PATH", tmp_path / "contract_cache.sqlite")
+    monkeypatch.setattr(contract_cache, "_memo", {})
+    return contract_cache
+
+
+class Clock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _fetcher(*answers):
+    calls = []
+    answers = list(answers)
+
+    def fetch(address):
+        calls.append(address)
+        return answers.pop(0)
+
+    fetch.calls = calls
+    return fetch
+
+
+def test_fresh_answer_skips_the_fetch(cache):
+    fetch = _fetcher(True)
+
+    assert cache.cached_is_contract(ADDR, fetch) is True
+    assert cache.cached_is_contract(ADDR.upper().replace("0X", "0x"), fetch) is True
+    assert fetch.calls == [ADDR.lower()]
+
+
+def test_answer_expires_after_ttl(cache, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    fetch = _fetcher(True, False)
+
+    cache.cached_is_contract(ADDR, fetch)
+    clock.now += cache.TTL_S - 1
+    assert cache.cached_is_contract(ADDR, fetch) is True
+    clock.now += 2
+    assert cache.cached_is_contract(ADDR, fetch) is False
+    assert len(fetch.calls) == 2
+
+
+def test_answer_survives_a_restart(cache):
+    cache.cached_is_contract(ADDR, _fetcher(True))
+    cache._memo.clear()  # new process: only the sqlite file is left
+
+    fetch = _fetcher()
+    assert cache.cached_is_contract(ADDR, fetch) is True
+    assert fetch.calls == []
+
+
+def test_failed_lookup_reports_false_and_is_not_stored(cache):
+    fetch = _fetcher(None, True)
+
+    assert cache.cached_is_contract(ADDR, fetch) is False
+    assert cache.cached_is_contract(ADDR, fetch) is True  # asked again, not served a cached False
+    assert len(fetch.calls) == 2
+
+
+def test_unwritable_store_still_answers(tmp_path, monkeypatch):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    monkeypatch.setattr(contract_cache, "CACHE_PATH", blocker / "contract_cache.sqlite")
+    monkeypatch.setattr(contract_cache, "_memo", {})
+
+    assert contract_cache.cached_is_contract(ADDR, _fetcher(True)) is True
+
+
+def _response(status, payload):
+    res = requests.Response()
+    res.status_code = status
+    res._content = orjson.dumps(payload)
+    return res
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        res = self.responses.pop(0)
+        if isinstance(res, Exception):
+            raise res
+        return res
+
+
+@pytest.fixture
+def etherscan(monkeypatch):
+    monkeypatch.setattr(contract_cache, "ETHERSCAN_CALLS_PER_S", 10_000)  # no pacing sleeps in tests
+
+    def install(*responses):
+        session = FakeSession(*responses)
+        monkeypatch.setattr(contract_cache, "SESSION", session)
+        return session
+
+    return install
+
+
+def test_verified_source_is_a_contract(etherscan):
+    etherscan(_response(200, {"status": "1", "result": [{"ABI": "[{}]"}]}))
+    assert contract_cache._etherscan_is_contract(ADDR) is True
+
+
+def test_unverified_or_eoa_is_not_a_contract(etherscan):
+    etherscan(_response(200, {"status": "1", "result": [{"ABI": "Contract source code not verified"}]}))
+    assert contract_cache._etherscan_is_contract(ADDR) is False
+
+
+def test_rate_limit_reply_is_retried(etherscan):
+    session = etherscan(
+        _response(200, {"status": "0", "result": "Max rate limit reached"}),
+        _response(200, {"status": "1", "result": [{"ABI": "[{}]"}]}),
+    )
+    assert contract_cache._etherscan_is_contract(ADDR) is True
+    assert session.calls == 2
+
+
+def test_persistent_rate_limit_gives_no_answer(etherscan):
+    session = etherscan(
+        *[_response(200, {"status": "0", "result": "Max rate limit reached"})] * contract_cache.ETHERSCAN_RETRIES
+    )
+    assert contract_cache._etherscan_is_contract(ADDR) is None
+    assert session.calls == contract_cache.ETHERSCAN_RETRIES
+
+
+@pytest.mark.parametrize("response", [
+    _response(502, {}),
+    requests.ConnectionError("reset"),
+    _response(200, {"status": "0", "result": "Invalid API Key"}),
+])
+def test_upstream_failures_give_no_answer(etherscan, response):
+    etherscan(response)
+    assert contract_cache._etherscan_is_contract(ADDR) is None
+
+
+def test_resolve_contracts_dedupes_and_skips_known(cache, monkeypatch):
+    seen = []
+    monkeypatch.setattr(cache, "is_contract", lambda a: seen.append(a) or a.endswith("1"))
+
+    result = cache.resolve_contracts(["0xA1", "0xa1", "0xB2", "", "0xc3"], known={"0xc3"})
+
+    assert result == {"0xa1": True, "0xb2": False}
+    assert sorted(seen) == ["0xa1", "0xb2"]
@@ -0,0 +1,89 @@
+# tests/test_decoder.py
+# decode_logs: per-log block numbers (mixed receipts), decoded event shapes,
+# malformed/unknown logs skipped without raising.
+
+from ingestion.decoder import ERC20_TRANSFER_TOPIC, decode_logs
+
+SWAP_V3_TOPIC = "0xd78ad95fa46c994b6551d0da85fc275fe613ce37657fb8d5e3d130840159d822"
+ALICE = "0x" + "0" * 24 + "a" * 40
+BOB = "0x" + "0" * 24 + "b" * 40
+
+
+def _word(value: int) -> str:
+    return (value % (1 << 256)).to_bytes(32, "big").hex()
+
+
+def transfer(block: str, amount: int = 1, tx_hash: str = "0x01") -> dict:
+    return {
+        "address": "0xtoken",
+        "topics": [ERC20_TRANSFER_TOPIC, ALICE, BOB],
+        "data": "0x" + _word(amount),
+        "blockNumber": block,
+        "transactionHash": tx_hash,
+    }
+
+
+def swap(block: str, amount0: int, amount1: int) -> dict:
+    return {
+        "address": "0xpool",
+        "topics": [SWAP_V3_TOPIC, ALICE, BOB],
+        "data": "0x" + _word(amount0) + _word(amount1),
+        "blockNumber": block,
+        "transactionHash": "0x02",
+    }
+
+
+def test_each_log_keeps_its_own_block_number():
+    logs = [transfer("0x10"), transfer("0x10"), swap("0x20", -5, 7), transfer("0x10"), transfer("0x30")]
+
+    assert [e["block_number"] for e in decode_logs(logs)] == [16, 16, 32, 16, 48]
+
+
+def test_missing_block_number_decodes_as_zero():
+    log = transfer("0x10")
+    del log["blockNumber"]
+
+    assert decode_logs([log])[0]["block_number"] == 0
+
+
+def test_transfer_fields():
+    (event,) = decode_logs([transfer("0x1", amount=10**18, tx_hash="0xabc")])
+
+    assert event == {
+        "event": "transfer",
+        "token_address": "0xtoken",
+        "from": "0x" + "a" * 40,
+        "to": "0x" + "b" * 40,
+        "amount": 10**18,
+        "tx_hash": "0xabc",
+        "block_number": 1,
+    }
+
+
+def test_swap_direction_from_amount_signs():
+    events = decode_logs([swap("0x1", -5, 7), swap("0x1", 3, -2)])
+
+    assert [(e["direction"], e["amount_in"], e["amount_out"]) for e in events] == [
+        ("token0→token1", 5.0, 7.0),
+        ("token1→token0", 2.0, 3.0),
+    ]
+
+
+def test_malformed_and_unknown_logs_are_skipped():
+    erc721 = transfer("0x1")
+    erc721["topics"] = erc721["topics"] + ["0x" + "0" * 63 + "1"]  # tokenId as a 4th topic
+    non_hex = transfer("0x1")
+    non_hex["data"] = "0xzz"
+    short_swap = swap("0x1", -5, 7)
+    short_swap["data"] = short_swap["data"][:66]
+    unknown = {"topics": ["0x" + "f" * 64], "data": "0x", "blockNumber": "0x1"}
+
+    bad_block = transfer("0xnope")
+
+    logs = [erc721, non_hex, short_swap, unknown, bad_block, {"topics": []}, {"topics": None}, {}, transfer("0x2")]
+
+    assert [e["block_number"] for e in decode_logs(logs)] == [2]
+
+
+def test_empty_input():
+    assert decode_logs([]) == []
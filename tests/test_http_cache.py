@@ -0,0 +1,128 @@
+# tests/test_http_cache.py
+# conditional_get: ETag/Last-Modified revalidation, 304 → stored body, cursor pages bypass the store.
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from mvp import http_cache
+
+URL = "https://example.test/api/wallets/0xabc/history"
+
+
+def _response(status, body=b"", headers=None):
+    res = requests.Response()
+    res.status_code = status
+    res._content = body
+    res.headers = CaseInsensitiveDict(headers or {})
+    return res
+
+
+class FakeSession:
+    """Replays queued responses and records the headers each GET was sent with."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        self.calls.append({"url": url, "headers": dict(headers or {}), "params": params})
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "CACHE_PATH", tmp_path / "http_cache.sqlite")
+    return tmp_path / "http_cache.sqlite"
+
+
+def _rows():
+    with http_cache.closing(http_cache._connect()) as conn:
+        return conn.execute("SELECT key, etag, last_modified FROM http_cache").fetchall()
+
+
+def test_304_serves_the_stored_body(store, monkeypatch):
+    session = FakeSession(
+        _response(200, b'{"result": [1]}', {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        _response(304),
+    )
+    monkeypatch.setattr(http_cache, "SESSION", session)
+
+    first = http_cache.conditional_get(URL, headers={"X-API-Key": "k"}, params={"limit": 100})
+    second = http_cache.conditional_get(URL, headers={"X-API-Key": "k"}, params={"limit": 100})
+
+    assert first.content == b'{"result": [1]}'
+    assert "If-None-Match" not in session.calls[0]["headers"]
+    # the stored validators go back upstream, the caller's headers are kept
+    assert session.calls[1]["headers"]["If-None-Match"] == '"v1"'
+    assert session.calls[1]["headers"]["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert session.calls[1]["headers"]["X-API-Key"] == "k"
+    # 304 is reported as a 200 carrying the stored body
+    assert second.status_code == 200
+    assert second.content == b'{"result": [1]}'
+
+
+def test_changed_body_replaces_the_stored_copy(store, monkeypatch):
+    session = FakeSession(
+        _response(200, b"old", {"ETag": '"v1"'}),
+        _response(200, b"new", {"ETag": '"v2"'}),
+        _response(304),
+    )
+    monkeypatch.setattr(http_cache, "SESSION", session)
+
+    http_cache.conditional_get(URL)
+    http_cache.conditional_get(URL)
+    third = http_cache.conditional_get(URL)
+
+    assert session.calls[2]["headers"]["If-None-Match"] == '"v2"'
+    assert third.content == b"new"
+
+
+def test_responses_without_validators_are_not_stored(store, monkeypatch):
+    monkeypatch.setattr(http_cache, "SESSION", FakeSession(_response(200, b"body")))
+
+    assert http_cache.conditional_get(URL).content == b"body"
+    assert _rows() == []
+
+
+def test_errors_are_not_stored(store, monkeypatch):
+    monkeypatch.setattr(http_cache, "SESSION", FakeSession(_response(500, b"boom", {"ETag": '"v1"'})))
+
+    assert http_cache.conditional_get(URL).status_code == 500
+    assert _rows() == []
+
+
+def test_cursor_pages_bypass_the_store(store, monkeypatch):
+    session = FakeSession(
+        _response(200, b"page-2", {"ETag": '"p2"'}),
+        _response(200, b"page-2", {"ETag": '"p2"'}),
+    )
+    monkeypatch.setattr(http_cache, "SESSION", session)
+
+    params = {"cursor": "abc", "limit": 100}
+    http_cache.conditional_get(URL, params=params)
+    http_cache.conditional_get(URL, params=params)
+
+    assert _rows() == []
+    assert all("If-None-Match" not in call["headers"] for call in session.calls)
+
+
+def test_empty_cursor_is_the_first_page_and_is_cached(store, monkeypatch):
+    monkeypatch.setattr(http_cache, "SESSION", FakeSession(_response(200, b"page-1", {"ETag": '"p1"'})))
+
+    http_cache.conditional_get(URL, params={"cursor": "", "limit": 100})
+
+    assert [etag for _, etag, _ in _rows()] == ['"p1"']
+
+
+def test_store_is_capped_at_max_rows(store, monkeypatch):
+    monkeypatch.setattr(http_cache, "MAX_ROWS", 3)
+    monkeypatch.setattr(
+        http_cache, "SESSION", FakeSession(*(_response(200, b"x", {"ETag": f'"{i}"'}) for i in range(5)))
+    )
+
+    for i in range(5):
+        http_cache.conditional_get(URL, params={"page": i})
+
+    # the oldest-written rows are evicted first
+    assert sorted(etag for _, etag, _ in _rows()) == ['"2"', '"3"', '"4"']
@@ -0,0 +1,66 @@
+# tests/test_is_evm_addr.py
+# is_evm_addr (bytes.fromhex check) must accept exactly what the original regex accepted.
+#
+# app/app.py is a Streamlit script (importing it renders the page), so the function is
+# compiled on its own from the app source.
+
+import ast
+import random
+import re
+from pathlib import Path
+
+import pytest
+
+APP_PY = Path(__file__).resolve().parents[1] / "app" / "app.py"
+ORIGINAL = re.compile(r"^0x[a-fA-F0-9]{40}$")
+
+
+def _load_is_evm_addr():
+    tree = ast.parse(APP_PY.read_text(encoding="utf-8"))
+    (fn,) = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name == "is_evm_addr"]
+    namespace = {}
+    exec(compile(ast.Module(body=[fn], type_ignores=[]), str(APP_PY), "exec"), namespace)
+    return namespace["is_evm_addr"]
+
+
+is_evm_addr = _load_is_evm_addr()
+
+VALID = "0x0193138F52c349A66d0b7Ccbe29d70E613E6C968"
+
+
+@pytest.mark.parametrize("s", [
+    VALID,
+    VALID.lower(),
+    "0x" + "A" * 40,
+    "0x" + "0" * 40,
+])
+def test_accepts_addresses(s):
+    assert is_evm_addr(s)
+
+
+@pytest.mark.parametrize("s", [
+    "",
+    "0x",
+    VALID[2:],                     # no prefix
+    "0X" + VALID[2:],              # uppercase prefix
+    VALID[:-1],                    # 39 hex chars
+    VALID + "0",                   # 41 hex chars
+    VALID[:-1] + "g",              # non-hex
+    " " + VALID[1:],               # leading space, right length
+    VALID[:20] + " " + VALID[21:],  # embedded space (fromhex would skip it)
+    VALID[:-2] + " 9",             # space between bytes
+    VALID[:-1] + "\n",
+    "0x" + "٠" * 40,               # non-ASCII digits
+    "vitalik.eth",
+])
+def test_rejects_everything_else(s):
+    assert not is_evm_addr(s)
+
+
+def test_agrees_with_the_original_regex_on_random_inputs():
+    rng = random.Random(1234)
+    alphabet = "0123456789abcdefABCDEFxXgG \t"
+    for _ in range(20_000):
+        body = "".join(rng.choice(alphabet) for _ in range(rng.choice((38, 39, 40, 41, 42))))
+        s = rng.choice(("0x", "0X", "", "x0")) + body
+        assert is_evm_addr(s) == bool(ORIGINAL.match(s)), repr(s)
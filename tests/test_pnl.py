@@ -0,0 +1,139 @@
+# tests/test_pnl.py
+# The NumPy calculate_eth_pnl must agree with the original per-tx Decimal loop.
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from walletglass_core.processing import pnl
+from walletglass_core.processing.transaction import Transaction
+
+WALLET = "0x0193138F52c349A66d0b7Ccbe29d70E613E6C968"
+CEX = "0x28c6c06298d514db089934071355e5743bf21d60"
+FRIEND = "0x1111111111111111111111111111111111111111"
+ETH_NOW = 3100.0
+DAY = 86400
+T0 = 1_700_092_800  # 2023-11-16 00:00 UTC, a UTC day number divisible by 7
+
+
+def price_at(ts: int) -> float:
+    """Deterministic daily close: changes per UTC day, 0.0 (no price) on days divisible by 7."""
+    day = ts // DAY
+    return 0.0 if day % 7 == 0 else 1500.0 + (day % 13) * 37.5
+
+
+def tx(day: int, frm: str, to: str, value: str, token_symbol=None) -> Transaction:
+    return Transaction(
+        tx_hash=f"0x{day:064x}",
+        timestamp=datetime.fromtimestamp(T0 + day * DAY + 3600, tz=timezone.utc),
+        from_address=frm,
+        to_address=to,
+        value_eth=Decimal(value),
+        gas_used=21000,
+        gas_price_gwei=Decimal("20"),
+        token_symbol=token_symbol,
+    )
+
+
+def reference_eth_pnl(transactions, wallet_address):
+    """The original loop (Decimal, one price lookup per tx, unpriced txs skipped)."""
+    received = sent = cost_basis = realized = Decimal("0.0")
+    for t in transactions:
+        if t.token_symbol and t.token_symbol != "ETH":
+            continue
+        if t.from_address.lower() == t.to_address.lower():
+            continue
+        price = price_at(int(t.timestamp.timestamp()))
+        if not price:
+            continue
+        price = Decimal(str(price))
+        if t.to_address.lower() == wallet_address.lower():
+            received += t.value_eth
+            cost_basis += t.value_eth * price
+        elif t.from_address.lower() == wallet_address.lower():
+            if received > 0:
+                avg_cost = (cost_basis / received).quantize(Decimal("0.01"))
+                realized += t.value_eth * price - t.value_eth * avg_cost
+            sent += t.value_eth
+    now = Decimal(str(ETH_NOW))
+    return {
+        "received": received,
+        "sent": sent,
+        "cost_basis": cost_basis.quantize(Decimal("0.01")),
+        "realized_profit": realized.quantize(Decimal("0.0001")),
+        "current_cost_basis": (received * now).quantize(Decimal("0.01")),
+        "unrealized_pnl": (received * now - cost_basis).quantize(Decimal("0.01")),
+        "eth_price_now": now.quantize(Decimal("0.01")),
+    }
+
+
+@pytest.fixture(autouse=True)
+def fixed_prices(monkeypatch):
+    monkeypatch.setattr(pnl, "get_prices_at_times", lambda ts: np.array([price_at(int(t)) for t in ts], dtype=np.float64))
+    monkeypatch.setattr(pnl, "fetch_current_eth_price", lambda: ETH_NOW)
+
+
+def history():
+    return [
+        tx(1, CEX, WALLET, "2.5"),
+        tx(2, WALLET, FRIEND, "0.75"),            # sell against the avg cost so far
+        tx(3, CEX, WALLET.lower(), "1.25"),       # case differences don't matter
+        tx(4, WALLET, WALLET.upper().replace("0X", "0x"), "9"),  # self transfer: skipped
+        tx(5, FRIEND, WALLET, "3", token_symbol="USDC"),         # not ETH: skipped
+        tx(7, CEX, WALLET, "4"),                  # day 7k: unpriced → skipped
+        tx(8, WALLET, CEX, "1.5"),
+        tx(9, FRIEND, WALLET, "0.125", token_symbol="ETH"),
+        tx(10, WALLET, FRIEND, "2"),
+        tx(11, FRIEND, CEX, "5"),                 # doesn't touch the wallet
+    ]
+
+
+def _as_floats(result):
+    return {k: float(v) for k, v in result.items()}
+
+
+def test_matches_the_original_loop():
+    txs = history()
+
+    assert _as_floats(pnl.calculate_eth_pnl(txs, WALLET)) == pytest.approx(
+        _as_floats(reference_eth_pnl(txs, WALLET)), abs=1e-9
+    )
+
+
+def test_sell_before_any_buy_counts_as_sent_without_realized_profit():
+    txs = [tx(1, WALLET, FRIEND, "1"), tx(2, CEX, WALLET, "2")]
+    result = pnl.calculate_eth_pnl(txs, WALLET)
+
+    assert result["sent"] == Decimal("1.0")
+    assert result["realized_profit"] == Decimal("0")
+    assert _as_floats(result) == pytest.approx(_as_floats(reference_eth_pnl(txs, WALLET)), abs=1e-9)
+
+
+def test_unpriced_transactions_are_skipped():
+    result = pnl.calculate_eth_pnl([tx(7, CEX, WALLET, "4"), tx(14, CEX, WALLET, "1")], WALLET)
+
+    assert result["received"] == Decimal("0.0")
+    assert result["cost_basis"] == Decimal("0.00")
+
+
+def test_malformed_addresses_are_not_self_transfers():
+    # unparseable addresses never match the wallet (or each other) and leave real transfers alone
+    txs = [tx(1, "not-an-address", WALLET, "1"), tx(2, "0xzz", "0xyy", "5")]
+    result = pnl.calculate_eth_pnl(txs, WALLET)
+
+    assert result["received"] == Decimal("1.0")
+
+
+def test_malformed_wallet_matches_nothing():
+    txs = [tx(1, "bogus", "bogus", "1"), tx(2, CEX, "bogus", "1")]
+
+    assert pnl.calculate_eth_pnl(txs, "bogus")["received"] == Decimal("0.0")
+
+
+def test_empty_history():
+    result = pnl.calculate_eth_pnl([], WALLET)
+
+    assert result["received"] == Decimal("0.0")
+    assert result["eth_price_now"] == Decimal("3100.00")
@@ -0,0 +1,89 @@
+# tests/test_receipt_cache.py
+# Receipts are stored only once FINALITY_CONFIRMATIONS blocks deep; the head block is reused briefly.
+
+import os
+
+import orjson
+import pytest
+import requests
+
+os.environ.setdefault("ALCHEMY_API_KEY", "test-key")  # alchemy_adapter refuses to import without one
+
+from ingestion import _receipt_cache, alchemy_adapter
+
+HEAD = 20_000_000
+
+
+def _receipt(block: int, tx_hash: str = "0xAA") -> dict:
+    return {"transactionHash": tx_hash, "blockNumber": hex(block), "logs": [{"data": "0x01"}]}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(_receipt_cache, "CACHE_PATH", tmp_path / "receipt_cache.sqlite")
+    monkeypatch.setattr(_receipt_cache, "_conn", None)
+    yield _receipt_cache
+    if _receipt_cache._conn is not None:
+        _receipt_cache._conn.close()
+
+
+def test_receipt_exactly_at_the_finality_depth_is_stored(store):
+    deep = HEAD - store.FINALITY_CONFIRMATIONS
+    store.put_many({"0xAA": _receipt(deep)}, HEAD)
+
+    assert store.get_many(["0xaa"]) == {"0xaa": _receipt(deep)}
+
+
+def test_younger_receipt_is_not_stored(store):
+    store.put_many({"0xbb": _receipt(HEAD - store.FINALITY_CONFIRMATIONS + 1)}, HEAD)
+
+    assert store.get_many(["0xbb"]) == {}
+
+
+def test_only_the_final_receipts_of_a_batch_are_stored(store):
+    store.put_many({
+        "0x01": _receipt(HEAD - 100),
+        "0x02": _receipt(HEAD - 1),   # too young
+        "0x03": None,                 # RPC returned no receipt
+        "0x04": {"logs": []},         # pending: no blockNumber yet
+    }, HEAD)
+
+    assert set(store.get_many(["0x01", "0x02", "0x03", "0x04"])) == {"0x01"}
+
+
+def test_lookup_is_case_insensitive_and_misses_are_absent(store):
+    store.put_many({"0xAbC": _receipt(HEAD - 50)}, HEAD)
+
+    assert set(store.get_many(["0xABC", "0xdef"])) == {"0xabc"}
+
+
+def test_lookup_of_many_hashes_spans_parameter_chunks(store):
+    receipts = {f"0x{i:04x}": _receipt(HEAD - 50) for i in range(1200)}
+    store.put_many(receipts, HEAD)
+
+    assert len(store.get_many(receipts)) == 1200
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = 0
+
+    def post(self, url, json=None):
+        self.calls += 1
+        res = requests.Response()
+        res.status_code = 200
+        res._content = orjson.dumps({"jsonrpc": "2.0", "id": 1, "result": hex(HEAD + self.calls)})
+        return res
+
+
+def test_head_block_is_reused_within_max_age(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(alchemy_adapter, "_SESSION", session)
+    monkeypatch.setattr(alchemy_adapter, "_head", (0.0, 0))
+
+    first = alchemy_adapter.fetch_latest_block()
+    assert alchemy_adapter.fetch_latest_block() == first
+    assert session.calls == 1
+
+    assert alchemy_adapter.fetch_latest_block(max_age=0) == first + 1
+    assert session.calls == 2
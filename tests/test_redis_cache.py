@@ -0,0 +1,116 @@
+# tests/test_redis_cache.py
+# cached_fetch: Redis hit/miss, dynamic TTL per policy, stale fallback when the upstream call fails.
+
+import orjson
+import pytest
+
+from mvp import redis_cache
+
+
+class FakeRedis:
+    """get/setex over a dict; records the TTL each key was written with."""
+
+    def __init__(self, fail_get=False, fail_set=False):
+        self.store = {}
+        self.ttls = {}
+        self.fail_get = fail_get
+        self.fail_set = fail_set
+
+    def get(self, key):
+        if self.fail_get:
+            raise ConnectionError("redis down")
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        if self.fail_set:
+            raise ConnectionError("redis down")
+        self.store[key] = value
+        self.ttls[key] = ttl
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    r = FakeRedis()
+    monkeypatch.setattr(redis_cache, "_redis", lambda: r)
+    return r
+
+
+def _upstream(result=None, error=None):
+    calls = []
+
+    def fetch(address):
+        calls.append(address)
+        if error is not None:
+            raise error
+        return dict(result)
+
+    fetch.calls = calls
+    return fetch
+
+
+@pytest.mark.parametrize("kind", sorted(redis_cache.TTL_POLICY))
+def test_dynamic_ttl_is_clamped_to_the_policy(kind):
+    lo, hi = redis_cache.TTL_POLICY[kind]
+    assert redis_cache.dynamic_ttl(kind, 0.0) == lo
+    assert redis_cache.dynamic_ttl(kind, 10_000.0) == hi
+    assert lo <= redis_cache.dynamic_ttl(kind, 0.1) <= hi
+
+
+def test_slower_calls_are_kept_longer():
+    assert redis_cache.dynamic_ttl("funding", 5.0) > redis_cache.dynamic_ttl("funding", 1.0)
+
+
+def test_miss_fetches_and_stores_fresh_and_stale_copies(fake_redis):
+    fetch = _upstream({"funded_usd": 12.5})
+
+    assert redis_cache.cached_fetch("funding", "0xABC", fetch) == {"funded_usd": 12.5}
+
+    key = "wg:funding:0xabc"
+    assert orjson.loads(fake_redis.store[key]) == {"funded_usd": 12.5}
+    assert fake_redis.ttls[key] == redis_cache.TTL_POLICY["funding"][0]  # instant fetch → policy floor
+    assert fake_redis.ttls[f"{key}:stale"] == redis_cache.STALE_TTL
+
+
+def test_hit_skips_the_upstream_call(fake_redis):
+    fake_redis.store["wg:portfolio:0xabc"] = orjson.dumps({"current_value_usd": 3.0})
+    fetch = _upstream({"current_value_usd": 99.0})
+
+    assert redis_cache.cached_fetch("portfolio", "0xAbC", fetch) == {"current_value_usd": 3.0}
+    assert fetch.calls == []
+
+
+def test_upstream_failure_serves_the_stale_copy_flagged(fake_redis):
+    fake_redis.store["wg:funding:0xabc:stale"] = orjson.dumps({"funded_usd": 7.0})
+
+    data = redis_cache.cached_fetch("funding", "0xabc", _upstream(error=RuntimeError("moralis 500")))
+
+    assert data == {"funded_usd": 7.0, "stale": True}
+
+
+def test_upstream_failure_without_stale_copy_reraises(fake_redis):
+    with pytest.raises(RuntimeError, match="moralis 500"):
+        redis_cache.cached_fetch("funding", "0xabc", _upstream(error=RuntimeError("moralis 500")))
+
+
+def test_redis_errors_fall_back_to_the_upstream_call(monkeypatch):
+    r = FakeRedis(fail_get=True, fail_set=True)
+    monkeypatch.setattr(redis_cache, "_redis", lambda: r)
+    fetch = _upstream({"defunded_usd": 1.0})
+
+    assert redis_cache.cached_fetch("defunding", "0xabc", fetch) == {"defunded_usd": 1.0}
+    assert fetch.calls == ["0xabc"]
+
+
+def test_without_redis_calls_pass_straight_through(monkeypatch):
+    monkeypatch.setattr(redis_cache, "_redis", lambda: None)
+    fetch = _upstream({"funded_usd": 1.0})
+
+    redis_cache.cached_fetch("funding", "0xabc", fetch)
+    redis_cache.cached_fetch("funding", "0xabc", fetch)
+
+    assert fetch.calls == ["0xabc", "0xabc"]
+
+
+def test_stale_result_carries_the_payload():
+    err = redis_cache.StaleResult({"funded_usd": 1.0, "stale": True})
+    assert err.data["stale"] is True
@@ -0,0 +1,159 @@
+# tests/test_token_pnl.py
+# The bincount-based calculate_token_pnl must agree with the original per-event Decimal loop.
+#
+# token_pnl imports its swap decoder (parser.parse_swap_events) and raw-tx fetcher
+# (ingestion.etherscan) at module level and neither exists in the tree yet, so the
+# fixture provides both before importing it; every test replaces them with fixed events.
+
+import importlib
+import sys
+import types
+from collections import defaultdict
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+DAY = 86400
+T0 = 1_700_092_800  # UTC day number divisible by 7
+ETH_NOW = 2950.0
+
+
+def price_at(ts: int) -> float:
+    day = ts // DAY
+    return 0.0 if day % 7 == 0 else 1800.0 + (day % 11) * 12.25
+
+
+def event(day: int, symbol: str, direction: str, amount: float, address: str = None) -> dict:
+    return {
+        "token_symbol": symbol,
+        "token_address": address or f"0x{symbol.lower():0>40}",
+        "amount": amount,
+        "direction": direction,
+        "timestamp": T0 + day * DAY + 60,
+        "pair_symbol": "ETH",
+    }
+
+
+def reference_token_pnl(swap_events):
+    """The original loop: Decimal accumulators, one price lookup per event, unpriced events skipped."""
+    data = defaultdict(lambda: {
+        "token_address": "",
+        "total_acquired": Decimal("0"),
+        "total_sold": Decimal("0"),
+        "invested_usd": Decimal("0"),
+        "proceeds_usd": Decimal("0"),
+    })
+    for tx in swap_events:
+        price = price_at(tx["timestamp"])
+        if not price:
+            continue
+        price = Decimal(str(price))
+        amount = Decimal(str(tx["amount"]))
+        d = data[tx["token_symbol"]]
+        d["token_address"] = tx["token_address"]
+        if tx["direction"] == "buy":
+            d["total_acquired"] += amount
+            d["invested_usd"] += amount * price
+        elif tx["direction"] == "sell":
+            d["total_sold"] += amount
+            d["proceeds_usd"] += amount * price
+
+    now = Decimal(str(ETH_NOW))
+    results = {}
+    for symbol, d in data.items():
+        acquired, sold = d["total_acquired"], d["total_sold"]
+        invested, proceeds = d["invested_usd"], d["proceeds_usd"]
+        holding = acquired - sold
+        realized = proceeds - invested
+        unrealized = holding * now
+        results[symbol] = {
+            "symbol": symbol,
+            "token_address": d["token_address"],
+            "total_acquired": round(acquired, 4),
+            "total_sold": round(sold, 4),
+            "net_holding": round(holding, 4),
+            "avg_buy_price_usd": round(invested / acquired, 8) if acquired > 0 else 0,
+            "avg_sell_price_usd": round(proceeds / sold, 8) if sold > 0 else 0,
+            "total_invested_usd": round(invested, 2),
+            "total_proceeds_usd": round(proceeds, 2),
+            "realized_pnl_usd": round(realized, 2),
+            "unrealized_value_usd": round(unrealized, 2),
+            "net_pnl_after_gas_usd": round(realized + unrealized, 2),
+        }
+    return results
+
+
+@pytest.fixture
+def token_pnl(monkeypatch):
+    etherscan = types.ModuleType("walletglass_core.ingestion.etherscan")
+    etherscan.fetch_raw_eth_transactions = lambda wallet: []
+    monkeypatch.setitem(sys.modules, "walletglass_core.ingestion.etherscan", etherscan)
+    parser = importlib.import_module("walletglass_core.processing.parser")
+    monkeypatch.setattr(parser, "parse_swap_events", lambda raw_txs: [], raising=False)
+    monkeypatch.delitem(sys.modules, "walletglass_core.processing.token_pnl", raising=False)
+
+    module = importlib.import_module("walletglass_core.processing.token_pnl")
+    monkeypatch.setattr(module, "get_prices_at_times", lambda ts: np.array([price_at(int(t)) for t in ts], dtype=np.float64))
+    monkeypatch.setattr(module, "fetch_current_eth_price", lambda: ETH_NOW)
+    return module
+
+
+def run(module, monkeypatch, events):
+    monkeypatch.setattr(module, "parse_swap_events", lambda raw_txs: events)
+    return module.calculate_token_pnl("0xwallet")
+
+
+def _assert_same(actual, expected):
+    assert actual.keys() == expected.keys()
+    for symbol, row in expected.items():
+        assert actual[symbol]["symbol"] == row["symbol"]
+        assert actual[symbol]["token_address"] == row["token_address"]
+        for key, value in row.items():
+            if key not in ("symbol", "token_address"):
+                assert float(actual[symbol][key]) == pytest.approx(float(value), abs=1e-8), (symbol, key)
+
+
+def test_matches_the_original_loop(token_pnl, monkeypatch):
+    events = [
+        event(1, "PEPE", "buy", 1_000_000.0),
+        event(2, "PEPE", "buy", 250_000.5),
+        event(3, "PEPE", "sell", 400_000.25),
+        event(1, "USDC", "buy", 1250.75),
+        event(4, "USDC", "sell", 1250.75),
+        event(5, "LINK", "sell", 3.5),                         # sold, never bought here
+        event(6, "ARB", "buy", 10.0),
+        event(7, "ARB", "buy", 99.0),                          # unpriced day: skipped
+        event(8, "ARB", "transfer", 5.0),                      # neither buy nor sell
+        event(9, "PEPE", "buy", 1.0, address="0x" + "9" * 40),  # last address seen wins
+    ]
+
+    _assert_same(run(token_pnl, monkeypatch, events), reference_token_pnl(events))
+
+
+def test_no_buys_or_no_sells_report_zero_averages(token_pnl, monkeypatch):
+    events = [event(1, "LINK", "sell", 2.0), event(2, "ARB", "buy", 4.0)]
+    result = run(token_pnl, monkeypatch, events)
+
+    assert result["LINK"]["avg_buy_price_usd"] == 0
+    assert result["ARB"]["avg_sell_price_usd"] == 0
+    _assert_same(result, reference_token_pnl(events))
+
+
+def test_token_with_only_unpriced_events_is_absent(token_pnl, monkeypatch):
+    result = run(token_pnl, monkeypatch, [event(7, "ARB", "buy", 1.0), event(2, "PEPE", "buy", 1.0)])
+
+    assert set(result) == {"PEPE"}
+
+
+def test_values_are_decimals_rounded_like_before(token_pnl, monkeypatch):
+    result = run(token_pnl, monkeypatch, [event(1, "PEPE", "buy", 1.23456789), event(2, "PEPE", "sell", 0.5)])
+    row = result["PEPE"]
+
+    assert isinstance(row["total_acquired"], Decimal)
+    assert row["total_acquired"] == Decimal("1.2346")
+    assert -row["total_invested_usd"].as_tuple().exponent <= 2
+
+
+def test_no_events(token_pnl, monkeypatch):
+    assert run(token_pnl, monkeypatch, []) == {}
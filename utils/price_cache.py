@@ -2,7 +2,7 @@
 
 import os
 import requests
-import json
+import orjson
 from datetime import datetime
 from time import sleep
 
@@ -11,14 +11,14 @@ CRYPTOCOMPARE_BASE_URL = "https://min-api.cryptocompare.com/data/v2/histoday"
 
 def load_price_cache():
     if os.path.exists(PRICE_CACHE_FILE):
-        with open(PRICE_CACHE_FILE, "r") as f:
-            return json.load(f)
+        with open(PRICE_CACHE_FILE, "rb") as f:
+            return orjson.loads(f.read())
     return {}
 
 def save_price_cache(cache):
     os.makedirs("data", exist_ok=True)
-    with open(PRICE_CACHE_FILE, "w") as f:
-        json.dump(cache, f, indent=2)
+    with open(PRICE_CACHE_FILE, "wb") as f:
+        f.write(orjson.dumps(cache, option=orjson.OPT_INDENT_2))
 
 def get_price_usd(symbol: str, contract_address: str, timestamp_iso: str, cache: dict) -> float:
     """